@@ -0,0 +1,213 @@
+"""
+Phase 6 (in-memory backend): Code Object Generator
+Builds a Python ast.Module straight from optimized quadruples and compiles
+it to a code object, without producing or re-parsing source text.
+"""
+
+import ast
+import importlib.util
+import marshal
+from types import CodeType
+from typing import Callable, Dict, List, Optional, Tuple
+
+from codegen import INT_TABLE_ROWS, Chunker, SimulatorGenerator
+from icg import Quadruple
+
+
+# Bytecode is only valid for the interpreter that produced it
+BYTECODE_TAG = importlib.util.MAGIC_NUMBER
+
+BINARY_OPS = {'AND': ast.BitAnd, 'OR': ast.BitOr, 'XOR': ast.BitXor}
+
+
+class ASTCodeGenerator(SimulatorGenerator):
+    """
+    Generates a code object defining simulate() and simulate_packed().
+    
+    The functions compute the same values as the ones CodeGenerator writes
+    as text. NOT, NAND and NOR are an XOR with the all-ones value (1 for
+    simulate, the row mask for simulate_packed), so no call to int() is needed.
+    Tables are int or bytes constants of the code object.
+    """
+    
+    def operand(self, name: str, ones: ast.expr) -> ast.expr:
+        """Return the expression reading an operand, mapping constants to 0 and ones."""
+        if name == '1':
+            return ones
+        if name == '0':
+            return ast.Constant(0)
+        return ast.Name(name, ast.Load())
+    
+    def operation(self, quad: Quadruple, ones: ast.expr) -> ast.stmt:
+        """Convert a quadruple to an assignment statement."""
+        arg1 = self.operand(quad.arg1, ones)
+        
+        if quad.op == 'ASSIGN':
+            value = arg1
+        elif quad.op == 'NOT':
+            value = ast.BinOp(arg1, ast.BitXor(), ones)
+        elif quad.op in BINARY_OPS:
+            value = ast.BinOp(arg1, BINARY_OPS[quad.op](), self.operand(quad.arg2, ones))
+        elif quad.op == 'NAND':
+            value = ast.BinOp(ast.BinOp(arg1, ast.BitAnd(), self.operand(quad.arg2, ones)),
+                              ast.BitXor(), ones)
+        elif quad.op == 'NOR':
+            value = ast.BinOp(ast.BinOp(arg1, ast.BitOr(), self.operand(quad.arg2, ones)),
+                              ast.BitXor(), ones)
+        else:
+            raise ValueError(f"Unknown operation '{quad.op}'")
+        
+        return ast.Assign([ast.Name(quad.result, ast.Store())], value)
+    
+    def slot(self, index: int, context: ast.expr_context) -> ast.Subscript:
+        """Return the expression for slot index of the chunk value list _v."""
+        return ast.Subscript(ast.Name(self.values, ast.Load()), ast.Constant(index), context)
+    
+    def chunk_functions(self, plan: Chunker, name: str, params: List[str],
+                        ones: ast.expr) -> List[ast.FunctionDef]:
+        """Build the _<name>_<i>(_v, *params) function of every chunk in the plan."""
+        functions = []
+        for index, chunk in enumerate(plan.chunks):
+            body: List[ast.stmt] = [ast.Assign([ast.Name(value, ast.Store())], self.slot(slot, ast.Load()))
+                                    for value, slot in plan.loads[index]]
+            body.extend(self.operation(quad, ones) for quad in chunk)
+            body.extend(ast.Assign([self.slot(slot, ast.Store())], ast.Name(value, ast.Load()))
+                        for value, slot in plan.stores[index])
+            functions.append(self.definition(f"{self.chunk_prefix[name]}{index}",
+                                             [self.values] + params, body))
+        return functions
+    
+    def driver(self, plan: Chunker, name: str, params: List[str]) -> List[ast.stmt]:
+        """Build the statements that run every chunk and read the OUTPUTs from _v."""
+        inputs = set(plan.inputs)
+        values: ast.expr = ast.List([ast.Name(value, ast.Load()) if value in inputs else ast.Constant(None)
+                                     for value in plan.entry], ast.Load())
+        spare = plan.size - len(plan.entry)
+        if spare:
+            values = ast.BinOp(values, ast.Add(),
+                               ast.BinOp(ast.List([ast.Constant(None)], ast.Load()), ast.Mult(),
+                                         ast.Constant(spare)))
+        
+        body: List[ast.stmt] = [ast.Assign([ast.Name(self.values, ast.Store())], values)]
+        for index in range(len(plan.chunks)):
+            call = ast.Call(ast.Name(f"{self.chunk_prefix[name]}{index}", ast.Load()),
+                            [ast.Name(param, ast.Load()) for param in [self.values] + params], [])
+            body.append(ast.Expr(call))
+        body.extend(ast.Assign([ast.Name(output, ast.Store())], self.slot(slot, ast.Load()))
+                    for output, slot in zip(plan.outputs, plan.results))
+        return body
+    
+    def lookup(self, output: str, row_support: Optional[List[str]]
+               ) -> Tuple[List[ast.stmt], Optional[List[str]]]:
+        """
+        Build the statements reading output from its truth table, computing
+        the row variable unless it already holds the row of row_support.
+        Returns the statements and the support the row variable then holds.
+        """
+        support, table = self.lookups.tables[output]
+        target = ast.Name(output, ast.Store())
+        if not support:
+            return [ast.Assign([target], ast.Constant(table & 1))], row_support
+        
+        row: ast.expr = ast.Name(support[0], ast.Load())
+        for j, name in enumerate(support[1:], 1):
+            row = ast.BinOp(row, ast.BitOr(),
+                            ast.BinOp(ast.Name(name, ast.Load()), ast.LShift(), ast.Constant(j)))
+        one = ast.Constant(1)
+        
+        rows = 1 << len(support)
+        if rows <= INT_TABLE_ROWS:
+            bit = ast.BinOp(ast.Constant(table), ast.RShift(), row)
+            return [ast.Assign([target], ast.BinOp(bit, ast.BitAnd(), one))], row_support
+        
+        index = self.lookups.row_variable()
+        data = ast.Constant(table.to_bytes(rows // 8, 'little'))
+        byte = ast.Subscript(data, ast.BinOp(ast.Name(index, ast.Load()), ast.RShift(), ast.Constant(3)),
+                             ast.Load())
+        bit = ast.BinOp(byte, ast.RShift(),
+                        ast.BinOp(ast.Name(index, ast.Load()), ast.BitAnd(), ast.Constant(7)))
+        body: List[ast.stmt] = []
+        if support != row_support:
+            body.append(ast.Assign([ast.Name(index, ast.Store())], row))
+        body.append(ast.Assign([target], ast.BinOp(bit, ast.BitAnd(), one)))
+        return body, support
+    
+    def function(self, name: str, inputs: List[str], extra: List[str], outputs: List[str],
+                 ones: ast.expr, quads: List[Quadruple], plan: Optional[Chunker],
+                 lookups: bool = False) -> List[ast.FunctionDef]:
+        """
+        Build one simulator function taking inputs + extra over quads,
+        preceded by its chunk functions (which also take extra). With
+        lookups, OUTPUTs with a truth table are then read from it.
+        """
+        if plan is None:
+            functions = []
+            body = [self.operation(quad, ones) for quad in quads]
+        else:
+            functions = self.chunk_functions(plan, name, extra, ones)
+            body = self.driver(plan, name, extra)
+        if lookups:
+            row_support = None
+            for output in self.lookups.tables:
+                statements, row_support = self.lookup(output, row_support)
+                body.extend(statements)
+        
+        if len(outputs) == 1:
+            returned = ast.Name(outputs[0], ast.Load())
+        else:
+            returned = ast.Tuple([ast.Name(output, ast.Load()) for output in outputs], ast.Load())
+        body.append(ast.Return(returned))
+        
+        functions.append(self.definition(name, inputs + extra, body))
+        return functions
+    
+    def definition(self, name: str, params: List[str], body: List[ast.stmt]) -> ast.FunctionDef:
+        """Build a function definition taking params positionally."""
+        arguments = ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(param) for param in params],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        )
+        return ast.FunctionDef(name, arguments, body, decorator_list=[], returns=None,
+                               type_params=[])
+    
+    def build_module(self) -> ast.Module:
+        """Build the module AST defining simulate() and simulate_packed()."""
+        inputs = self.symbol_table.names_in('INPUT')
+        outputs = self.symbol_table.names_in('OUTPUT')
+        
+        module = ast.Module(
+            self.function('simulate', inputs, [], outputs, ast.Constant(1),
+                          self.lookups.quads, self.simulate_plan, lookups=True)
+            + self.function('simulate_packed', inputs, [self.mask], outputs,
+                            ast.Name(self.mask, ast.Load()), self.quads, self.plan),
+            type_ignores=[])
+        return ast.fix_missing_locations(module)
+    
+    def generate(self) -> CodeType:
+        """Compile the module AST to a code object."""
+        return compile(self.build_module(), f"<circuit {self.circuit_name}>", 'exec')
+
+
+def load_functions(code: CodeType) -> Dict[str, Callable]:
+    """Run a generated code object and return the functions it defines."""
+    namespace: Dict[str, object] = {}
+    exec(code, namespace)
+    return {name: value for name, value in namespace.items() if callable(value)}
+
+
+def dump_code(code: CodeType) -> bytes:
+    """Serialize a code object for the compile cache."""
+    return BYTECODE_TAG + marshal.dumps(code)
+
+
+def load_code(data: bytes) -> Optional[CodeType]:
+    """Deserialize a code object from dump_code(), or None if another interpreter wrote it."""
+    if not data.startswith(BYTECODE_TAG):
+        return None
+    try:
+        return marshal.loads(data[len(BYTECODE_TAG):])
+    except (ValueError, EOFError, TypeError):
+        return None
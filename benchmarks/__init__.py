@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the Logic Gate Architect Compiler.
+Run individual benchmarks from the repository root, e.g.:
+
+    python -m benchmarks.lexer_throughput
+"""
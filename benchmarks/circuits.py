@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Synthetic circuit generators for benchmarks.
+Builds parametric .gate sources (ripple-carry adders, array multipliers,
+magnitude comparators, parity trees and random DAGs) of 10^3 to 10^6 gates.
+
+    python -m benchmarks.circuits adder 64 > adder64.gate
+"""
+
+import argparse
+import random
+import sys
+from typing import Dict, List, Optional, Tuple
+
+
+class CircuitBuilder:
+    """Accumulates declarations and gates and renders them as .gate source."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.inputs: List[str] = []
+        self.outputs: Dict[str, str] = {}  # Output name -> signal driving it
+        self.gates: List[Tuple[str, str, List[str]]] = []  # (result, op, operands)
+        self.wire_count = 0
+    
+    def input(self, name: str) -> str:
+        """Declare an INPUT and return its name."""
+        self.inputs.append(name)
+        return name
+    
+    def gate(self, op: str, *operands: str) -> str:
+        """Add a gate driving a fresh wire and return the wire's name."""
+        wire = f"w{self.wire_count}"
+        self.wire_count += 1
+        self.gates.append((wire, op, list(operands)))
+        return wire
+    
+    def output(self, name: str, signal: str):
+        """Make signal drive the OUTPUT name."""
+        self.outputs[name] = signal
+    
+    def half_adder(self, a: str, b: str) -> Tuple[str, str]:
+        """Return (sum, carry) of a + b."""
+        return self.gate('XOR', a, b), self.gate('AND', a, b)
+    
+    def full_adder(self, a: str, b: str, carry: str) -> Tuple[str, str]:
+        """Return (sum, carry) of a + b + carry."""
+        partial = self.gate('XOR', a, b)
+        total = self.gate('XOR', partial, carry)
+        generate = self.gate('AND', a, b)
+        propagate = self.gate('AND', partial, carry)
+        return total, self.gate('OR', generate, propagate)
+    
+    def render(self) -> str:
+        """Return the circuit as .gate source text."""
+        # Gates driving an output write it directly; the other wires keep
+        # their generated names. Outputs driven by an INPUT, or by the same
+        # wire as another output, get a buffer gate.
+        driven = {result for result, _, _ in self.gates}
+        rename: Dict[str, str] = {}
+        buffers = []
+        for name, signal in self.outputs.items():
+            if signal in driven and signal not in rename:
+                rename[signal] = name
+            else:
+                buffers.append((name, 'AND', [signal, signal]))
+        
+        wires = [result for result, _, _ in self.gates if result not in rename]
+        lines = [f"CIRCUIT {self.name} {{"]
+        lines.append(f"  INPUT {', '.join(self.inputs)};")
+        lines.append(f"  OUTPUT {', '.join(self.outputs)};")
+        for start in range(0, len(wires), 16):
+            lines.append(f"  WIRE {', '.join(wires[start:start + 16])};")
+        
+        for result, op, operands in self.gates + buffers:
+            args = ', '.join(rename.get(operand, operand) for operand in operands)
+            lines.append(f"  {rename.get(result, result)} = {op}({args});")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+
+def ripple_carry_adder(bits: int) -> CircuitBuilder:
+    """bits-wide adder S = A + B + Cin built from a chain of full adders."""
+    builder = CircuitBuilder(f"RippleCarryAdder{bits}")
+    a = [builder.input(f"A{i}") for i in range(bits)]
+    b = [builder.input(f"B{i}") for i in range(bits)]
+    carry = builder.input("Cin")
+    
+    for i in range(bits):
+        total, carry = builder.full_adder(a[i], b[i], carry)
+        builder.output(f"S{i}", total)
+    builder.output("Cout", carry)
+    return builder
+
+
+def array_multiplier(bits: int) -> CircuitBuilder:
+    """bits x bits unsigned multiplier: AND partial products summed row by row."""
+    builder = CircuitBuilder(f"ArrayMultiplier{bits}")
+    a = [builder.input(f"A{i}") for i in range(bits)]
+    b = [builder.input(f"B{i}") for i in range(bits)]
+    
+    # acc[k] is the running sum bit of weight 2**k
+    acc = [builder.gate('AND', a[k], b[0]) for k in range(bits)]
+    for row in range(1, bits):
+        carry: Optional[str] = None
+        for k in range(bits):
+            product = builder.gate('AND', a[k], b[row])
+            position = row + k
+            if position >= len(acc):
+                if carry is None:
+                    acc.append(product)
+                else:
+                    total, carry = builder.half_adder(product, carry)
+                    acc.append(total)
+            elif carry is None:
+                acc[position], carry = builder.half_adder(acc[position], product)
+            else:
+                acc[position], carry = builder.full_adder(acc[position], product, carry)
+        if carry is not None:
+            acc.append(carry)
+    
+    for k, signal in enumerate(acc):
+        builder.output(f"P{k}", signal)
+    return builder
+
+
+def magnitude_comparator(bits: int) -> CircuitBuilder:
+    """bits-wide comparator with GT, EQ and LT outputs, rippling from the LSB."""
+    builder = CircuitBuilder(f"MagnitudeComparator{bits}")
+    a = [builder.input(f"A{i}") for i in range(bits)]
+    b = [builder.input(f"B{i}") for i in range(bits)]
+    
+    greater = less = equal = None
+    for i in range(bits):
+        bit_equal = builder.gate('NOT', builder.gate('XOR', a[i], b[i]))
+        bit_greater = builder.gate('AND', a[i], builder.gate('NOT', b[i]))
+        bit_less = builder.gate('AND', builder.gate('NOT', a[i]), b[i])
+        if i == 0:
+            greater, less, equal = bit_greater, bit_less, bit_equal
+        else:
+            # A higher bit decides unless it is equal
+            greater = builder.gate('OR', bit_greater, builder.gate('AND', bit_equal, greater))
+            less = builder.gate('OR', bit_less, builder.gate('AND', bit_equal, less))
+            equal = builder.gate('AND', bit_equal, equal)
+    
+    builder.output("GT", greater)
+    builder.output("EQ", equal)
+    builder.output("LT", less)
+    return builder
+
+
+def parity_tree(width: int) -> CircuitBuilder:
+    """Balanced XOR tree computing the parity of width inputs."""
+    builder = CircuitBuilder(f"ParityTree{width}")
+    level = [builder.input(f"D{i}") for i in range(width)]
+    
+    while len(level) > 1:
+        paired = [builder.gate('XOR', level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    
+    builder.output("P", level[0])
+    return builder
+
+
+def random_dag(gates: int, inputs: int = 64, outputs: int = 32, seed: int = 1) -> CircuitBuilder:
+    """
+    Random acyclic netlist of gates gates over inputs INPUTs.
+    
+    Every gate reads at least one signal nobody has read yet, so almost no
+    logic is dead. The signals still unread at the end become the OUTPUTs,
+    about outputs of them.
+    """
+    rng = random.Random(seed)
+    builder = CircuitBuilder(f"RandomDag{gates}")
+    signals = [builder.input(f"I{i}") for i in range(inputs)]
+    unread = list(signals)
+    ops = ['AND', 'OR', 'XOR', 'NAND', 'NOR', 'NOT']
+    
+    def take_unread() -> str:
+        index = rng.randrange(len(unread))
+        unread[index], unread[-1] = unread[-1], unread[index]
+        return unread.pop()
+    
+    for _ in range(gates):
+        op = rng.choice(ops)
+        first = take_unread() if unread else rng.choice(signals)
+        if op == 'NOT':
+            wire = builder.gate(op, first)
+        else:
+            # Consume a second unread signal while there are too many of them
+            if len(unread) > outputs:
+                second = take_unread()
+            else:
+                second = rng.choice(signals)
+                while second == first and len(signals) > 1:
+                    second = rng.choice(signals)
+            wire = builder.gate(op, first, second)
+        signals.append(wire)
+        unread.append(wire)
+    
+    inputs_left = set(builder.inputs)
+    results = [signal for signal in unread if signal not in inputs_left] or [signals[-1]]
+    for k, signal in enumerate(results):
+        builder.output(f"O{k}", signal)
+    return builder
+
+
+# Family name -> function building a circuit of roughly the given gate count
+FAMILIES = {
+    'adder': lambda gates: ripple_carry_adder(max(1, gates // 5)),
+    'multiplier': lambda gates: array_multiplier(max(2, round((gates / 6) ** 0.5))),
+    'comparator': lambda gates: magnitude_comparator(max(1, gates // 11)),
+    'parity': lambda gates: parity_tree(max(2, gates + 1)),
+    'random': lambda gates: random_dag(gates),
+}
+
+
+def main():
+    """Print a generated circuit as .gate source."""
+    parser = argparse.ArgumentParser(description='Generate a synthetic benchmark circuit')
+    parser.add_argument('family', choices=sorted(FAMILIES),
+                        help='Circuit family')
+    parser.add_argument('size', type=int,
+                        help='Approximate number of gates')
+    args = parser.parse_args()
+    
+    sys.stdout.write(FAMILIES[args.family](args.size).render())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
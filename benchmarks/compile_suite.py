@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Compiler and simulator throughput benchmark.
+Compiles synthetic circuits from benchmarks.circuits, times every compiler
+phase and the generated simulators, and compares gates/s and vectors/s with
+a stored baseline, failing when throughput drops beyond a threshold or when
+there is no baseline to compare with.
+
+    python -m benchmarks.compile_suite --save-baseline
+    python -m benchmarks.compile_suite
+    python -m benchmarks.compile_suite --large --repeat 1
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.circuits import FAMILIES
+from codegen import CodeGenerator, DEFAULT_CHUNK_SIZE
+from compiler import compile_source
+
+
+PHASES = ['lexical', 'syntax', 'semantic', 'icg', 'optimization', 'codegen']
+
+DEFAULT_BASELINE = Path(__file__).with_name('baseline.json')
+
+
+def best_compile(source: str, repeat: int):
+    """Compile source repeat times; return the result and best seconds per phase."""
+    best: Dict[str, float] = {}
+    for _ in range(repeat):
+        result = compile_source(source)
+        if not result.success:
+            raise RuntimeError(f"{result.failed_phase} phase failed: {result.errors[0]}")
+        for phase in PHASES:
+            best[phase] = min(best.get(phase, float('inf')), result.timings[phase])
+    return result, best
+
+
+def measure_simulators(result, sim_time: float, reuse_registers: bool = False,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, float]:
+    """
+    Build simulate() and simulate_packed() from the optimized quadruples and
+    return the Python compile time in seconds and the vectors/s of each.
+    The simulators are compiled one at a time, since Python's compiler needs
+    several kilobytes per statement and both at once do not fit in memory
+    at 10^6 gates.
+    """
+    codegen = CodeGenerator(result.optimized_quads, result.optimized_symbol_table, result.circuit,
+                            reuse_registers, chunk_size)
+    inputs = codegen.get_inputs()
+    outputs = codegen.get_outputs()
+    
+    rng = random.Random(0)
+    bits = [rng.getrandbits(1) for _ in inputs]
+    words = [rng.getrandbits(64) for _ in inputs] + [(1 << 64) - 1]
+    rates = {'pycompile': 0.0}
+    for name, generate, args, vectors_per_call in (
+            ('simulate', codegen.generate_simulate, bits, 1),
+            ('simulate_packed', codegen.generate_packed_simulate, words, 64)):
+        out = io.StringIO()
+        generate(out, inputs, outputs)
+        start = time.perf_counter()
+        code = compile(out.getvalue(), f"<{result.circuit}>", 'exec')
+        rates['pycompile'] += time.perf_counter() - start
+        del out
+        namespace: Dict[str, object] = {}
+        exec(code, namespace)
+        del code
+        
+        function = namespace[name]
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while calls == 0 or elapsed < sim_time:
+            function(*args)
+            calls += 1
+            elapsed = time.perf_counter() - start
+        rates[name] = calls * vectors_per_call / elapsed
+    return rates
+
+
+def run_case(family: str, size: int, repeat: int, sim_time: float,
+             reuse_registers: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, float]:
+    """Benchmark one circuit; return gates/s per phase and vectors/s per simulator."""
+    source = FAMILIES[family](size).render()
+    result, best = best_compile(source, repeat)
+    gates = len(result.quads)
+    
+    metrics = {'gates': gates}
+    for phase in PHASES:
+        metrics[phase] = gates / best[phase] if best[phase] else float('inf')
+    
+    # The simulators need only the optimized quadruples; free the rest first
+    result.tokens = result.ast = result.symbol_table = result.quads = result.code = None
+    metrics.update(measure_simulators(result, sim_time, reuse_registers, chunk_size))
+    return metrics
+
+
+def compare(case: str, metrics: Dict[str, float], baseline: Dict[str, float],
+            threshold: float) -> List[str]:
+    """Return one message per throughput that fell more than threshold below baseline."""
+    regressions = []
+    for name in PHASES + ['simulate', 'simulate_packed']:
+        expected = baseline.get(name)
+        if expected and metrics[name] < expected * (1 - threshold):
+            drop = 1 - metrics[name] / expected
+            regressions.append(f"{case} {name}: {metrics[name]:,.0f}/s is {drop:.0%} below "
+                               f"baseline {expected:,.0f}/s")
+    return regressions
+
+
+def main():
+    """Run the suite and fail on throughput regressions."""
+    parser = argparse.ArgumentParser(description='Compiler and simulator throughput benchmark')
+    parser.add_argument('--families', default=','.join(FAMILIES),
+                        help=f"Comma-separated circuit families (default: {','.join(FAMILIES)})")
+    parser.add_argument('--sizes', default='1000,10000',
+                        help='Comma-separated approximate gate counts (default: 1000,10000)')
+    parser.add_argument('--large', action='store_true',
+                        help='Use sizes 10^3 to 10^6 gates')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Compiles per circuit; the best time per phase is kept (default: 3)')
+    parser.add_argument('--sim-time', type=float, default=0.2,
+                        help='Seconds to run each simulator for (default: 0.2)')
+    parser.add_argument('--reuse-registers', action='store_true',
+                        help='Generate the simulators with wires in reused slots')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Quadruples per generated function; 0 disables chunking (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE),
+                        help='Baseline JSON file (default: benchmarks/baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store this run as the new baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed fractional throughput drop from the baseline (default: 0.25)')
+    parser.add_argument('--json', metavar='FILE',
+                        help='Also write the measurements to FILE')
+    args = parser.parse_args()
+    
+    families = [family.strip() for family in args.families.split(',')]
+    for family in families:
+        if family not in FAMILIES:
+            parser.error(f"unknown family '{family}'")
+    sizes = [1000, 10000, 100000, 1000000] if args.large else [int(size) for size in args.sizes.split(',')]
+    
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'Case':<18}  {'Gates':>8}  " + "  ".join(f"{phase[:8]:>8}" for phase in PHASES)
+          + f"  {'pycomp':>8}  {'sim/s':>10}  {'packed/s':>10}")
+    print(f"{'':<18}  {'':>8}  " + "  ".join(f"{'kgate/s':>8}" for _ in PHASES)
+          + f"  {'ms':>8}  {'':>10}  {'':>10}")
+    print("-" * 136)
+    for family in families:
+        for size in sizes:
+            case = f"{family}-{size}"
+            metrics = run_case(family, size, args.repeat, args.sim_time, args.reuse_registers,
+                               args.chunk_size)
+            results[case] = metrics
+            print(f"{case:<18}  {metrics['gates']:>8}  "
+                  + "  ".join(f"{metrics[phase] / 1000:>8.1f}" for phase in PHASES)
+                  + f"  {metrics['pycompile'] * 1000:>8.1f}  {metrics['simulate']:>10,.0f}"
+                  + f"  {metrics['simulate_packed']:>10,.0f}")
+    
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        stored = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        stored.update(results)
+        baseline_path.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"\n[OK] Baseline saved to {baseline_path}")
+        return 0
+    
+    if not baseline_path.exists():
+        print(f"\n[ERROR] No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 1
+    
+    baseline = json.loads(baseline_path.read_text())
+    regressions = []
+    compared = 0
+    for case, metrics in results.items():
+        if case in baseline:
+            compared += 1
+            regressions.extend(compare(case, metrics, baseline[case], args.threshold))
+    
+    if not compared:
+        print(f"\n[ERROR] No case of this run is in the baseline at {baseline_path}; "
+              f"run with --save-baseline to add them")
+        return 1
+    
+    if regressions:
+        print(f"\n[ERROR] Throughput dropped more than {args.threshold:.0%} below the baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    
+    print(f"\n[OK] {compared} of {len(results)} cases within {args.threshold:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Cycle detection scaling benchmark.
+Runs SemanticAnalyzer on gate chains up to 10^6 gates deep, checking that the
+SCC search completes without hitting the recursion limit, stays linear in
+chain length, and reports a feedback loop closed across the whole chain.
+"""
+
+import argparse
+import sys
+import time
+
+from parser import Program, Declaration, Gate
+from semantic import SemanticAnalyzer
+
+
+def build_chain(length: int, feedback: bool = False) -> Program:
+    """Build a ripple-style chain A -> w0 -> w1 -> ... -> Z of length gates."""
+    wires = [f"w{i}" for i in range(length - 1)]
+    gates = []
+    previous = "A"
+    for wire in wires:
+        gates.append(Gate(wire, 'AND', [previous, 'B']))
+        previous = wire
+    gates.append(Gate('Z', 'AND', [previous, 'B']))
+    
+    if feedback and wires:
+        # Close the loop: the head of the chain now reads the tail
+        gates[0] = Gate(wires[0], 'AND', ['Z', 'B'])
+    
+    declarations = [
+        Declaration('INPUT', ['A', 'B']),
+        Declaration('OUTPUT', ['Z']),
+        Declaration('WIRE', wires),
+    ]
+    return Program('Chain', declarations, gates)
+
+
+def time_analysis(ast: Program):
+    """Return (seconds, errors) for a full semantic analysis of ast."""
+    start = time.perf_counter()
+    result = SemanticAnalyzer(ast).analyze()
+    return time.perf_counter() - start, result['errors']
+
+
+def main():
+    """Run the benchmark and fail on errors or non-linear scaling."""
+    parser = argparse.ArgumentParser(description='Cycle detection scaling benchmark')
+    parser.add_argument('--sizes', default='250000,500000,1000000',
+                        help='Comma-separated chain lengths (default: 2.5*10^5 to 10^6)')
+    parser.add_argument('--tolerance', type=float, default=2.0,
+                        help='Maximum allowed growth of time per gate from smallest to largest chain')
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(',')]
+    per_gate = []
+    
+    print(f"{'Gates':>10}  {'Acyclic (s)':>12}  {'Feedback (s)':>12}  {'us/gate':>8}")
+    print("-" * 50)
+    for size in sizes:
+        elapsed, errors = time_analysis(build_chain(size))
+        if errors:
+            print(f"[ERROR] Acyclic chain of {size} gates reported: {errors[0]}")
+            return 1
+        
+        loop_elapsed, loop_errors = time_analysis(build_chain(size, feedback=True))
+        if len(loop_errors) != 1 or 'Cycle detected' not in loop_errors[0]:
+            print(f"[ERROR] Expected one feedback loop in {size}-gate chain, got {len(loop_errors)}")
+            return 1
+        
+        per_gate.append(elapsed / size)
+        print(f"{size:>10}  {elapsed:>12.3f}  {loop_elapsed:>12.3f}  {elapsed / size * 1e6:>8.2f}")
+    
+    growth = per_gate[-1] / per_gate[0]
+    print(f"\nTime per gate growth (largest/smallest): {growth:.2f}")
+    
+    if growth > args.tolerance:
+        print(f"[ERROR] Time per gate grew more than {args.tolerance}x; analysis is not linear")
+        return 1
+    
+    print("[OK] Semantic analysis scales linearly with chain length")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
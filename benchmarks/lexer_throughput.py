@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Lexer throughput benchmark.
+Tokenizes synthetic multi-megabyte .gate sources of doubling size and checks
+that throughput stays flat, i.e. that tokenizing is linear in input size.
+"""
+
+import argparse
+import sys
+import time
+
+from lexer import Lexer
+
+
+def generate_source(target_bytes: int) -> str:
+    """Generate a parity-chain circuit of roughly target_bytes characters."""
+    lines = [
+        "CIRCUIT Chain {",
+        "  INPUT A, B;",
+        "  OUTPUT Z;",
+    ]
+    size = sum(len(line) + 1 for line in lines)
+    previous = "A"
+    index = 0
+    
+    while size < target_bytes:
+        line = f"  w{index} = XOR({previous}, B);"
+        lines.append(line)
+        size += len(line) + 1
+        previous = f"w{index}"
+        index += 1
+    
+    lines.append(f"  Z = NOT({previous});")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def measure(source: str, repeat: int) -> float:
+    """Return the best tokenize time in seconds over repeat runs."""
+    lexer = Lexer()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        lexer.tokenize(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark and fail if throughput degrades with size."""
+    parser = argparse.ArgumentParser(description='Lexer throughput benchmark')
+    parser.add_argument('--sizes', default='1,2,4,8',
+                        help='Comma-separated source sizes in MB (default: 1,2,4,8)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per size; the best time is kept (default: 3)')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='Maximum allowed slowdown of MB/s from smallest to largest size')
+    args = parser.parse_args()
+    
+    sizes = [float(size) for size in args.sizes.split(',')]
+    throughputs = []
+    
+    print(f"{'Size (MB)':>10}  {'Time (s)':>10}  {'MB/s':>10}")
+    print("-" * 36)
+    for size in sizes:
+        source = generate_source(int(size * 1024 * 1024))
+        megabytes = len(source) / (1024 * 1024)
+        elapsed = measure(source, args.repeat)
+        throughput = megabytes / elapsed
+        throughputs.append(throughput)
+        print(f"{megabytes:>10.2f}  {elapsed:>10.3f}  {throughput:>10.2f}")
+    
+    slowdown = throughputs[0] / throughputs[-1]
+    print(f"\nThroughput ratio (smallest/largest): {slowdown:.2f}")
+    
+    if slowdown > args.tolerance:
+        print(f"[ERROR] Throughput dropped more than {args.tolerance}x; lexing is not linear")
+        return 1
+    
+    print("[OK] Lexer throughput is linear in input size")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
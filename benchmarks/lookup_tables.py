@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Truth-table lookup benchmark.
+Times simulate() on every example circuit and on small generated circuits,
+generated once with OUTPUTs read from truth tables (--lookup-support) and
+once evaluating gates for every OUTPUT, and fails when the tables make any
+circuit slower than the gates they replace.
+"""
+
+import argparse
+import io
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.circuits import FAMILIES
+from codegen import CodeGenerator, DEFAULT_LOOKUP_SUPPORT
+from compiler import compile_source
+
+
+EXAMPLES = Path(__file__).resolve().parent.parent / 'examples'
+
+GENERATED = [('comparator', 4), ('parity', 8), ('adder', 4), ('multiplier', 3)]
+
+
+def load_circuits() -> List[Tuple[str, str]]:
+    """Return (name, source) for every compilable example and generated circuit."""
+    circuits = [(path.stem, path.read_text()) for path in sorted(EXAMPLES.glob('*.gate'))]
+    circuits.extend((f"{family}-{size}", FAMILIES[family](size).render()) for family, size in GENERATED)
+    return circuits
+
+
+def build_simulate(result, lookup_support: int) -> Tuple[Callable, int]:
+    """Return simulate() generated with the given lookup support and its table count."""
+    codegen = CodeGenerator(result.optimized_quads, result.optimized_symbol_table, result.circuit,
+                            lookup_support=lookup_support)
+    out = io.StringIO()
+    codegen.generate_simulate(out, codegen.get_inputs(), codegen.get_outputs())
+    namespace: Dict[str, object] = {}
+    exec(compile(out.getvalue(), f"<{result.circuit}>", 'exec'), namespace)
+    return namespace['simulate'], len(codegen.lookups.tables)
+
+
+def time_calls(functions: List[Callable], vectors: List[List[int]], repeat: int) -> List[float]:
+    """
+    Return the best nanoseconds per call of each function over vectors.
+    Runs of the functions alternate, so load changes affect all alike.
+    """
+    best = [float('inf')] * len(functions)
+    for _ in range(repeat):
+        for index, function in enumerate(functions):
+            def run():
+                for vector in vectors:
+                    function(*vector)
+            elapsed = timeit.timeit(run, number=200) / (200 * len(vectors)) * 1e9
+            best[index] = min(best[index], elapsed)
+    return best
+
+
+def main():
+    """Run the benchmark and fail when tables slow simulate() down."""
+    parser = argparse.ArgumentParser(description='Truth-table lookup benchmark')
+    parser.add_argument('--lookup-support', type=int, default=DEFAULT_LOOKUP_SUPPORT,
+                        help=f'Largest support read from a table (default: {DEFAULT_LOOKUP_SUPPORT})')
+    parser.add_argument('--repeat', type=int, default=7,
+                        help='Timing runs per simulator; the best is kept (default: 7)')
+    parser.add_argument('--tolerance', type=float, default=1.1,
+                        help='Largest allowed slowdown of simulate() with tables (default: 1.1)')
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    slower = []
+    print(f"{'Circuit':<28}  {'Tables':>6}  {'Gates (ns)':>10}  {'Tables (ns)':>11}  {'Speedup':>7}")
+    print("-" * 70)
+    for name, source in load_circuits():
+        result = compile_source(source)
+        if not result.success:
+            continue
+        
+        gates, _ = build_simulate(result, 0)
+        tables, count = build_simulate(result, args.lookup_support)
+        width = len(result.optimized_symbol_table.names_in('INPUT'))
+        vectors = [[rng.getrandbits(1) for _ in range(width)] for _ in range(64)]
+        for vector in vectors:
+            if gates(*vector) != tables(*vector):
+                print(f"[ERROR] {name}: simulate() differs with tables for inputs {vector}")
+                return 1
+        
+        if count:
+            before, after = time_calls([gates, tables], vectors, args.repeat)
+        else:
+            before = after = time_calls([gates], vectors, args.repeat)[0]
+        print(f"{name:<28}  {count:>6}  {before:>10.0f}  {after:>11.0f}  {before / after:>6.2f}x")
+        if after > before * args.tolerance:
+            slower.append(f"{name}: {after:.0f} ns with tables, {before:.0f} ns without")
+    
+    if slower:
+        print(f"\n[ERROR] Tables made simulate() more than {args.tolerance}x slower:")
+        for message in slower:
+            print(f"  {message}")
+        return 1
+    
+    print(f"\n[OK] No circuit is more than {args.tolerance}x slower with tables")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
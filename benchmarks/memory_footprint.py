@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Memory footprint benchmark.
+Measures the bytes per gate held by the token stream, AST, symbol table and
+quadruples of a generated random netlist, using tracemalloc.
+"""
+
+import argparse
+import sys
+import tracemalloc
+
+from benchmarks.circuits import random_dag
+from icg import IntermediateCodeGenerator, QuadTable
+from lexer import Lexer
+from parser import Parser
+from semantic import SemanticAnalyzer
+
+
+def traced(build):
+    """Return (value, bytes still allocated by build())."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = build()
+        return value, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    """Print bytes per gate for each intermediate representation."""
+    parser = argparse.ArgumentParser(description='Memory footprint benchmark')
+    parser.add_argument('--gates', type=int, default=100000,
+                        help='Gates in the generated netlist (default: 100000)')
+    args = parser.parse_args()
+    
+    source = random_dag(args.gates).render()
+    
+    tokens, token_bytes = traced(lambda: Lexer().tokenize(source))
+    ast, ast_bytes = traced(lambda: Parser(tokens).parse_program())
+    del tokens
+    analysis, symbol_bytes = traced(lambda: SemanticAnalyzer(ast).analyze())
+    quads, quad_bytes = traced(lambda: IntermediateCodeGenerator(ast).generate())
+    table, table_bytes = traced(lambda: QuadTable.from_quads(quads))
+    
+    gates = len(ast.gates)
+    print(f"{'Structure':<28}  {'MB':>8}  {'Bytes/gate':>10}")
+    print("-" * 50)
+    for name, size in (
+        ('Tokens', token_bytes),
+        ('AST', ast_bytes),
+        ('Symbol table', symbol_bytes),
+        ('Quadruples (objects)', quad_bytes),
+        ('Quadruples (QuadTable)', table_bytes),
+    ):
+        print(f"{name:<28}  {size / (1024 * 1024):>8.2f}  {size / gates:>10.1f}")
+    
+    print(f"\nQuadTable uses {table_bytes / quad_bytes:.0%} of the memory of Quadruple objects")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Compile Cache
+Persists compilation results on disk so unchanged circuits skip all phases.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class CompileCache:
+    """
+    On-disk cache of compilation results with size-bounded LRU eviction.
+    
+    Each entry is a pickled dict stored as <key>.pkl, where the key is a
+    SHA-256 hash of the source text, the compiler version and the compile
+    options. A cache hit refreshes the entry's modification time, and when
+    the cache grows past max_bytes the least recently used entries are
+    removed first.
+    """
+    
+    def __init__(self, directory: str = '.gatecache', max_bytes: int = 64 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+    
+    def key(self, source_code: str, version: str, options: Dict[str, Any]) -> str:
+        """Build the cache key for a source text compiled with the given options."""
+        digest = hashlib.sha256()
+        digest.update(version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(repr(sorted(options.items())).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(source_code.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def path(self, key: str) -> Path:
+        """Return the file that stores the entry for key."""
+        return self.directory / f"{key}.pkl"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for key, or None on a miss."""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Corrupt or written by an incompatible compiler; drop it
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        
+        os.utime(path)  # Mark as most recently used
+        self.hits += 1
+        return entry
+    
+    def put(self, key: str, entry: Dict[str, Any]):
+        """Store an entry atomically, then evict old entries if over budget."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        
+        self.evict()
+    
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for path in self.directory.glob('*.pkl'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Removed by a concurrent compiler
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+    
+    def clear(self):
+        """Remove every cache entry."""
+        for path in self.directory.glob('*.pkl'):
+            path.unlink(missing_ok=True)
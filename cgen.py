@@ -0,0 +1,263 @@
+"""
+Phase 6 (native backend): C Code Generator
+Emits the optimized quadruples as a C99 function over 64-bit words, builds
+it with the system C compiler into a cached shared object and binds it
+through ctypes.
+"""
+
+import ctypes
+import hashlib
+import io
+import os
+import subprocess
+import tempfile
+from array import array
+from pathlib import Path
+from typing import List, TextIO
+
+from codegen import DEFAULT_CHUNK_SIZE, Chunker
+from icg import Quadruple
+from semantic import SymbolTable
+
+
+# Built libraries live next to the compile cache by default
+DEFAULT_NATIVE_DIR = os.path.join('.gatecache', 'native')
+
+CFLAGS = ['-std=c99', '-O2', '-shared', '-fPIC']
+
+ALL_ONES = (1 << 64) - 1
+
+C_OPERATORS = {'AND': '&', 'OR': '|', 'XOR': '^'}
+
+
+class NativeBuildError(RuntimeError):
+    """Raised when the C compiler cannot build the generated source."""
+
+
+class CCodeGenerator:
+    """
+    Generates a C99 translation unit from quadruples.
+    
+    Every wire is a uint64_t holding one circuit value per bit, so one
+    evaluation covers 64 input vectors. The exported entry point is
+    
+        void simulate_words(const uint64_t *in, uint64_t *out, size_t n)
+    
+    which evaluates n rows, reading one word per INPUT from in and writing
+    one word per OUTPUT to out (both row-major). Identifiers get a v_
+    prefix so circuit names cannot clash with C keywords. Circuits with
+    more than chunk_size quadruples are split into static chunk functions
+    passing live values in one array, as in CodeGenerator.
+    """
+    
+    def __init__(self, quads: List[Quadruple], symbol_table: SymbolTable, circuit_name: str,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.quads = quads
+        self.symbol_table = symbol_table
+        self.circuit_name = circuit_name
+        self.inputs = symbol_table.names_in('INPUT')
+        self.outputs = symbol_table.names_in('OUTPUT')
+        self.plan = None
+        
+        if chunk_size and len(quads) > chunk_size:
+            self.quads = Chunker.order(quads, self.outputs)
+            self.plan = Chunker(self.quads, self.inputs, self.outputs, chunk_size).plan()
+    
+    def operand(self, name: str) -> str:
+        """Return the C expression reading an operand."""
+        if name == '1':
+            return '~UINT64_C(0)'
+        if name == '0':
+            return 'UINT64_C(0)'
+        return f"v_{name}"
+    
+    def expression(self, quad: Quadruple) -> str:
+        """Return the C expression computing a quadruple's result."""
+        arg1 = self.operand(quad.arg1)
+        if quad.op == 'ASSIGN':
+            return arg1
+        if quad.op == 'NOT':
+            return f"~{arg1}"
+        
+        arg2 = self.operand(quad.arg2)
+        if quad.op == 'NAND':
+            return f"~({arg1} & {arg2})"
+        if quad.op == 'NOR':
+            return f"~({arg1} | {arg2})"
+        return f"{arg1} {C_OPERATORS[quad.op]} {arg2}"
+    
+    def assign(self, out: TextIO, declared: set, name: str, value: str):
+        """Write an assignment, declaring name on its first assignment in the function."""
+        if name in declared:
+            out.write(f"    v_{name} = {value};\n")
+        else:
+            declared.add(name)
+            out.write(f"    uint64_t v_{name} = {value};\n")
+    
+    def generate_operations(self, out: TextIO, declared: set, quads: List[Quadruple]):
+        """Write one statement per quadruple."""
+        for quad in quads:
+            self.assign(out, declared, quad.result, self.expression(quad))
+    
+    def generate_chunks(self, out: TextIO):
+        """Write one static chunk_<i>(uint64_t *v) function per chunk."""
+        plan = self.plan
+        for index, chunk in enumerate(plan.chunks):
+            declared: set = set()
+            out.write(f"static void chunk_{index}(uint64_t *v)\n{{\n")
+            for value, slot in plan.loads[index]:
+                self.assign(out, declared, value, f"v[{slot}]")
+            self.generate_operations(out, declared, chunk)
+            for value, slot in plan.stores[index]:
+                out.write(f"    v[{slot}] = v_{value};\n")
+            out.write("}\n\n")
+    
+    def generate_eval(self, out: TextIO):
+        """Write eval_row(), which evaluates one row of 64 vectors."""
+        out.write("static void eval_row(const uint64_t *in, uint64_t *out)\n{\n")
+        position = {name: index for index, name in enumerate(self.inputs)}
+        
+        if self.plan is None:
+            declared: set = set()
+            for index, name in enumerate(self.inputs):
+                self.assign(out, declared, name, f"in[{index}]")
+            self.generate_operations(out, declared, self.quads)
+            for index, name in enumerate(self.outputs):
+                out.write(f"    out[{index}] = v_{name};\n")
+        else:
+            plan = self.plan
+            out.write(f"    uint64_t v[{max(plan.size, 1)}];\n")
+            for slot, value in enumerate(plan.entry):
+                if value in position:
+                    out.write(f"    v[{slot}] = in[{position[value]}];\n")
+            for index in range(len(plan.chunks)):
+                out.write(f"    chunk_{index}(v);\n")
+            for index, slot in enumerate(plan.results):
+                out.write(f"    out[{index}] = v[{slot}];\n")
+        
+        out.write("    (void)in;\n")
+        out.write("}\n\n")
+    
+    def write(self, out: TextIO):
+        """Write the complete C source to a text sink."""
+        out.write("/* Generated by Logic Gate Architect Compiler */\n")
+        out.write(f"/* Circuit: {self.circuit_name} */\n\n")
+        out.write("#include <stddef.h>\n#include <stdint.h>\n\n")
+        
+        if self.plan is not None:
+            self.generate_chunks(out)
+        self.generate_eval(out)
+        
+        out.write("void simulate_words(const uint64_t *in, uint64_t *out, size_t n)\n{\n")
+        out.write("    for (size_t i = 0; i < n; i++)\n")
+        out.write(f"        eval_row(in + i * {len(self.inputs)}, out + i * {len(self.outputs)});\n")
+        out.write("}\n")
+    
+    def generate(self) -> str:
+        """Generate the complete C source as a string."""
+        out = io.StringIO()
+        self.write(out)
+        return out.getvalue()
+
+
+def build_library(c_source: str, directory: str = DEFAULT_NATIVE_DIR) -> Path:
+    """
+    Build c_source into a shared object with the system C compiler ($CC,
+    or cc) and return its path. Libraries are named by a hash of the
+    source, compiler and flags, so an unchanged circuit is built only once.
+    
+    Raises:
+        NativeBuildError: If the compiler is missing or fails
+    """
+    compiler = os.environ.get('CC', 'cc')
+    digest = hashlib.sha256()
+    digest.update(' '.join([compiler] + CFLAGS).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(c_source.encode('utf-8'))
+    
+    directory = Path(directory)
+    library = directory / f"{digest.hexdigest()}.so"
+    if library.exists():
+        return library
+    
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, source_path = tempfile.mkstemp(dir=directory, suffix='.c')
+    temp_library = source_path[:-2] + '.so.tmp'
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(c_source)
+        try:
+            process = subprocess.run([compiler] + CFLAGS + ['-o', temp_library, source_path],
+                                     capture_output=True, text=True)
+        except OSError as e:
+            raise NativeBuildError(f"Cannot run C compiler '{compiler}': {e}") from e
+        if process.returncode != 0:
+            raise NativeBuildError(f"C compiler '{compiler}' failed:\n{process.stderr.strip()}")
+        os.replace(temp_library, library)
+    finally:
+        Path(source_path).unlink(missing_ok=True)
+        Path(temp_library).unlink(missing_ok=True)
+    return library
+
+
+class NativeSimulator:
+    """
+    ctypes binding of a library built from CCodeGenerator output.
+    
+    simulate() has the signature of the generated Python simulate().
+    simulate_words() evaluates many rows of 64 packed vectors per word at
+    native speed; it takes a NumPy uint64 array of shape (n, num_inputs)
+    (returning one of shape (n, num_outputs)) or a sequence of rows of
+    ints (returning a list of tuples).
+    """
+    
+    def __init__(self, library: Path, inputs: List[str], outputs: List[str]):
+        self.library = ctypes.CDLL(str(Path(library).resolve()))
+        self.inputs = inputs
+        self.outputs = outputs
+        self.function = self.library.simulate_words
+        self.function.argtypes = [ctypes.POINTER(ctypes.c_uint64), ctypes.POINTER(ctypes.c_uint64),
+                                  ctypes.c_size_t]
+        self.function.restype = None
+    
+    def simulate(self, *values: int):
+        """Evaluate one input vector; returns one 0/1 value (or a tuple) like simulate()."""
+        if len(values) != len(self.inputs):
+            raise TypeError(f"simulate() takes {len(self.inputs)} arguments ({len(values)} given)")
+        words = (ctypes.c_uint64 * max(len(self.inputs), 1))(
+            *[ALL_ONES if value else 0 for value in values])
+        result = (ctypes.c_uint64 * max(len(self.outputs), 1))()
+        self.function(words, result, 1)
+        bits = tuple(word & 1 for word in result[:len(self.outputs)])
+        return bits[0] if len(bits) == 1 else bits
+    
+    def simulate_words(self, words):
+        """Evaluate rows of packed input words; see the class docstring."""
+        if hasattr(words, '__array_interface__'):
+            import numpy as np
+            words = np.ascontiguousarray(words, dtype=np.uint64)
+            if words.ndim != 2 or words.shape[1] != len(self.inputs):
+                raise ValueError(f"simulate_words expects an array of shape (n, {len(self.inputs)})")
+            result = np.empty((words.shape[0], len(self.outputs)), dtype=np.uint64)
+            pointer = ctypes.POINTER(ctypes.c_uint64)
+            self.function(words.ctypes.data_as(pointer), result.ctypes.data_as(pointer),
+                          words.shape[0])
+            return result
+        
+        rows = [list(row) for row in words]
+        for row in rows:
+            if len(row) != len(self.inputs):
+                raise ValueError(f"simulate_words expects rows of {len(self.inputs)} words")
+        flat = array('Q', [word for row in rows for word in row] or [0])
+        result = array('Q', bytes(8 * max(len(rows) * len(self.outputs), 1)))
+        self.function((ctypes.c_uint64 * len(flat)).from_buffer(flat),
+                      (ctypes.c_uint64 * len(result)).from_buffer(result), len(rows))
+        width = len(self.outputs)
+        return [tuple(result[start:start + width]) for start in range(0, len(rows) * width, width)]
+
+
+def load_native(c_source: str, symbol_table: SymbolTable,
+                directory: str = DEFAULT_NATIVE_DIR) -> NativeSimulator:
+    """Build (or reuse) the library for c_source and bind it."""
+    return NativeSimulator(build_library(c_source, directory), symbol_table.names_in('INPUT'),
+                           symbol_table.names_in('OUTPUT'))
@@ -3,32 +3,535 @@ Phase 6: Code Generator
 Generates Python code from optimized quadruples.
 """
 
-from typing import List
+import heapq
+import io
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, TextIO, Tuple
 from icg import Quadruple
-from semantic import SymbolInfo
+from semantic import SymbolTable
 
 
-class CodeGenerator:
-    """Generates Python code from quadruples."""
+# Quadruples per generated function when splitting into chunks; 0 never splits
+DEFAULT_CHUNK_SIZE = 0
+
+# OUTPUTs depending on at most this many INPUTs are table lookups in simulate()
+DEFAULT_LOOKUP_SUPPORT = 16
+
+# Tables of up to this many rows are int constants, larger ones bytes
+INT_TABLE_ROWS = 64
+
+# Operations simulate() spends per quadruple; int(not ...) costs about a call
+GATE_COST = {'ASSIGN': 0, 'AND': 1, 'OR': 1, 'XOR': 1, 'NOT': 4, 'NAND': 5, 'NOR': 5}
+
+# Generated modules print the truth table only up to this many INPUTs
+TRUTH_TABLE_MAX_INPUTS = 20
+
+
+def circuit_identifiers(quads: List[Quadruple], inputs: List[str], outputs: List[str]) -> Set[str]:
+    """Return every identifier (and constant) the quadruples and ports use."""
+    names = set(inputs + outputs)
+    for quad in quads:
+        names.update((quad.arg1, quad.arg2, quad.result))
+    names.discard(None)
+    return names
+
+
+def free_name(name: str, identifiers: Set[str]) -> str:
+    """Prefix name with underscores until it clashes with no circuit identifier."""
+    while name in identifiers:
+        name = '_' + name
+    return name
+
+
+def free_prefix(prefix: str, identifiers: Set[str]) -> str:
+    """Prefix prefix with underscores until no circuit identifier starts with it."""
+    while any(name.startswith(prefix) for name in identifiers):
+        prefix = '_' + prefix
+    return prefix
+
+
+class RegisterAllocator:
+    """
+    Maps wire values onto a small set of reused slots by liveness.
+    
+    Walking the scheduled quadruples in order, a wire's slot is released
+    after its last read and the next result takes a released slot before a
+    new one is opened, so the slot count is the largest number of wires
+    live at once rather than the number of wires. Pinned names (INPUTs and
+    OUTPUTs) and names assigned more than once keep their own names.
+    """
+    
+    def __init__(self, quads: List[Quadruple], pinned: List[str], prefix: str = '_r'):
+        self.quads = quads
+        self.pinned = set(pinned)
+        self.slot_of: Dict[str, int] = {}  # Wire name -> slot number
+        self.slots = 0
+        
+        # Slot names must not clash with any identifier in the circuit
+        self.prefix = free_prefix(prefix, circuit_identifiers(quads, pinned, []))
+    
+    def register(self, slot: int) -> str:
+        """Return the variable name of a slot."""
+        return f"{self.prefix}{slot}"
+    
+    def registers(self) -> List[str]:
+        """Return the variable names of every slot, in slot order."""
+        return [self.register(slot) for slot in range(self.slots)]
+    
+    def allocate(self) -> List[Quadruple]:
+        """
+        Assign slots and return copies of the quadruples with every
+        allocated wire renamed to its slot. The input list is not modified.
+        """
+        last_read: Dict[str, int] = {}
+        assigned: Dict[str, int] = {}
+        for index, quad in enumerate(self.quads):
+            last_read[quad.arg1] = index
+            if quad.arg2 is not None:
+                last_read[quad.arg2] = index
+            assigned[quad.result] = assigned.get(quad.result, 0) + 1
+        
+        free: List[int] = []
+        renamed: List[Quadruple] = []
+        slot_of = self.slot_of
+        
+        for index, quad in enumerate(self.quads):
+            operands = (quad.arg1,) if quad.arg2 in (None, quad.arg1) else (quad.arg1, quad.arg2)
+            for operand in operands:
+                if operand in slot_of and last_read[operand] == index:
+                    free.append(slot_of[operand])
+            
+            # Releasing operands first lets a result reuse its operand's slot
+            result = quad.result
+            if result not in self.pinned and assigned[result] == 1:
+                if free:
+                    slot = free.pop()
+                else:
+                    slot = self.slots
+                    self.slots += 1
+                slot_of[result] = slot
+                if result not in last_read:
+                    free.append(slot)  # Never read
+            
+            copy = Quadruple(quad.op, self.rename(quad.arg1), self.rename(quad.arg2),
+                             self.rename(result))
+            copy.level = quad.level
+            renamed.append(copy)
+        
+        return renamed
+    
+    def rename(self, name: Optional[str]) -> Optional[str]:
+        """Return a name's slot variable, or the name itself if it has no slot."""
+        slot = self.slot_of.get(name)
+        return name if slot is None else self.register(slot)
+
+
+class Chunker:
+    """
+    Splits scheduled quadruples into chunk functions and plans the slots of
+    the list passing live values between them; a slot is reused once the
+    last chunk reading its value has run.
+    """
+    
+    def __init__(self, quads: List[Quadruple], inputs: List[str], outputs: List[str],
+                 chunk_size: int):
+        self.quads = quads
+        self.inputs = inputs
+        self.outputs = outputs
+        self.chunks = [quads[start:start + chunk_size] for start in range(0, len(quads), chunk_size)]
+        self.loads: List[List[Tuple[str, int]]] = []  # Per chunk: (name, slot) read on entry
+        self.stores: List[List[Tuple[str, int]]] = []  # Per chunk: (name, slot) written on exit
+        self.entry: List[str] = []  # Names in slots 0, 1, ... when the driver starts
+        self.results: List[int] = []  # Slot holding each OUTPUT at the end
+        self.size = 0  # Slots in the list
+    
+    @staticmethod
+    def order(quads: List[Quadruple], outputs: List[str]) -> List[Quadruple]:
+        """
+        Return the quadruples in depth-first order from the OUTPUTs, so few
+        values stay live across chunks. Names assigned more than once keep
+        the original order.
+        """
+        producer = {quad.result: index for index, quad in enumerate(quads)}
+        if len(producer) != len(quads):
+            return list(quads)
+        
+        visited = [False] * len(quads)
+        ordered: List[Quadruple] = []
+        roots = [producer[name] for name in outputs if name in producer]
+        for root in roots + list(range(len(quads))):
+            if visited[root]:
+                continue
+            visited[root] = True
+            stack = [(root, 0)]
+            while stack:
+                index, position = stack[-1]
+                quad = quads[index]
+                if position < 2:
+                    stack[-1] = (index, position + 1)
+                    operand = quad.arg1 if position == 0 else quad.arg2
+                    child = producer.get(operand)
+                    if child is not None and not visited[child]:
+                        visited[child] = True
+                        stack.append((child, 0))
+                else:
+                    stack.pop()
+                    ordered.append(quad)
+        return ordered
+    
+    def plan(self) -> 'Chunker':
+        """Compute loads, stores and slots for every chunk; returns self."""
+        end = len(self.chunks)  # Last read of values still needed after every chunk
+        names: List[str] = []  # Per live range: its name,
+        defined: List[int] = []  # the chunk assigning it (-1 before the first),
+        last: List[int] = []  # and the chunk reading it last
+        current: Dict[str, int] = {}  # Name -> its live range at this point
+        
+        def define(name: str, chunk: int) -> int:
+            current[name] = len(names)
+            names.append(name)
+            defined.append(chunk)
+            last.append(chunk)
+            return current[name]
+        
+        for name in self.inputs:
+            define(name, -1)
+        
+        loaded: List[List[int]] = []
+        for index, chunk in enumerate(self.chunks):
+            reads: List[int] = []
+            seen: Set[int] = set()
+            for quad in chunk:
+                for operand in (quad.arg1, quad.arg2):
+                    if operand is None or operand in ('0', '1'):
+                        continue
+                    value = current.get(operand)
+                    if value is None:
+                        value = define(operand, -1)
+                    if defined[value] < index and value not in seen:
+                        seen.add(value)
+                        reads.append(value)
+                    last[value] = index
+                define(quad.result, index)
+            loaded.append(reads)
+        
+        for name in self.outputs:
+            if name in current:
+                last[current[name]] = end
+        
+        # Values crossing a boundary, by the chunk storing and the chunk freeing them
+        stored: List[List[int]] = [[] for _ in self.chunks]
+        freed: List[List[int]] = [[] for _ in self.chunks]
+        entry: List[int] = []
+        for value in range(len(names)):
+            if defined[value] < last[value]:
+                (entry if defined[value] < 0 else stored[defined[value]]).append(value)
+                if last[value] < end:
+                    freed[last[value]].append(value)
+        
+        slot: Dict[int, int] = {}
+        free: List[int] = []
+        
+        def allocate(values: List[int]):
+            for value in values:
+                if free:
+                    slot[value] = heapq.heappop(free)
+                else:
+                    slot[value] = self.size
+                    self.size += 1
+        
+        allocate(entry)
+        self.entry = [names[value] for value in entry]
+        
+        for index in range(len(self.chunks)):
+            self.loads.append([(names[value], slot[value]) for value in loaded[index]])
+            # Loads happen on entry, so their slots can take this chunk's stores
+            for value in freed[index]:
+                heapq.heappush(free, slot[value])
+            allocate(stored[index])
+            self.stores.append([(names[value], slot[value]) for value in stored[index]])
+        
+        self.results = [slot[current[name]] for name in self.outputs]
+        return self
+
+
+class SupportAnalyzer:
+    """
+    Computes the support (INPUTs it depends on) of every OUTPUT in one
+    forward pass, and truth tables for OUTPUTs with small support by
+    evaluating only their cones on packed rows. Supports wider than
+    max_support are recorded as None, keeping the pass linear.
+    """
+    
+    def __init__(self, quads: List[Quadruple], inputs: List[str], outputs: List[str],
+                 max_support: Optional[int] = None):
+        self.quads = quads
+        self.inputs = inputs
+        self.outputs = outputs
+        self.max_support = max_support
+        self.operands: List[Tuple[int, int]] = []  # Per quad: producer index of arg1, arg2 (-1: none)
+        self.producer: Dict[str, int] = {}  # Name -> index of the quad that last assigned it
+        # OUTPUT -> INPUT positions it depends on (None: more than max_support)
+        self.support: Dict[str, Optional[FrozenSet[int]]] = {}
+    
+    def analyze(self) -> 'SupportAnalyzer':
+        """Link operands to producers and compute every OUTPUT's support; returns self."""
+        position = {name: frozenset((index,)) for index, name in enumerate(self.inputs)}
+        producer = self.producer
+        limit = self.max_support
+        supports: List[Optional[FrozenSet[int]]] = []
+        empty: FrozenSet[int] = frozenset()
+        
+        def support_of(operand: Optional[str]) -> Tuple[int, Optional[FrozenSet[int]]]:
+            index = producer.get(operand, -1)
+            if index >= 0:
+                return index, supports[index]
+            return -1, position.get(operand, empty)
+        
+        for index, quad in enumerate(self.quads):
+            first, support1 = support_of(quad.arg1)
+            second, support2 = support_of(quad.arg2)
+            self.operands.append((first, second))
+            if support1 is None or support2 is None:
+                support = None
+            elif support2 <= support1:
+                support = support1
+            else:
+                support = support1 | support2
+                if limit is not None and len(support) > limit:
+                    support = None
+            supports.append(support)
+            producer[quad.result] = index
+        
+        for output in self.outputs:
+            if output in producer:
+                self.support[output] = supports[producer[output]]
+        return self
+    
+    def support_inputs(self, output: str) -> List[str]:
+        """Return the INPUTs output depends on, in declaration order."""
+        return [self.inputs[index] for index in sorted(self.support[output])]
+    
+    def cone(self, outputs: List[str]) -> List[int]:
+        """Return the sorted indices of the quadruples the given OUTPUTs depend on."""
+        seen = set()
+        pending = [self.producer[output] for output in outputs if output in self.producer]
+        while pending:
+            index = pending.pop()
+            if index >= 0 and index not in seen:
+                seen.add(index)
+                pending.extend(self.operands[index])
+        return sorted(seen)
+    
+    def truth_table(self, output: str) -> Tuple[List[str], int]:
+        """
+        Return (support inputs, table) for an assigned OUTPUT, where bit r of
+        table is the OUTPUT's value when support input j is bit j of r.
+        """
+        support = self.support_inputs(output)
+        rows = 1 << len(support)
+        mask = (1 << rows) - 1
+        
+        # Input j toggles every 2**j rows: w zeros then w ones, repeated
+        values: Dict[str, int] = {'0': 0, '1': mask}
+        for j, name in enumerate(support):
+            width = 1 << j
+            values[name] = mask // ((1 << width) + 1) << width
+        
+        results: Dict[int, int] = {}
+        
+        def value(operand: Optional[str], index: int) -> int:
+            return results[index] if index >= 0 else values[operand]
+        
+        for index in self.cone([output]):
+            quad = self.quads[index]
+            first, second = self.operands[index]
+            arg1 = value(quad.arg1, first)
+            arg2 = value(quad.arg2, second) if quad.arg2 is not None else 0
+            
+            if quad.op == 'ASSIGN':
+                result = arg1
+            elif quad.op == 'NOT':
+                result = arg1 ^ mask
+            elif quad.op == 'AND':
+                result = arg1 & arg2
+            elif quad.op == 'OR':
+                result = arg1 | arg2
+            elif quad.op == 'XOR':
+                result = arg1 ^ arg2
+            elif quad.op == 'NAND':
+                result = (arg1 & arg2) ^ mask
+            else:
+                result = (arg1 | arg2) ^ mask
+            results[index] = result
+        
+        return support, results[self.producer[output]]
+
+
+class LookupTables:
+    """
+    Chooses the OUTPUTs simulate() reads from precomputed truth tables.
+    
+    An OUTPUT whose support has at most max_support INPUTs gets a table
+    computed at compile time by SupportAnalyzer when the gates the table
+    saves cost more (by GATE_COST) than the lookup (see choose()), and
+    simulate() evaluates gates only for the cones of the remaining OUTPUTs
+    (quads, outputs).
+    Bit r of a table is the OUTPUT's value for row r, where support input
+    j is bit j of r. Tables of up to INT_TABLE_ROWS rows are int constants
+    shifted right by the row; larger ones are module-level bytes constants
+    indexed by row >> 3, so every lookup takes constant time.
+    """
+    
+    def __init__(self, quads: List[Quadruple], inputs: List[str], outputs: List[str],
+                 max_support: int, prefix: str = '_lut'):
+        self.tables: Dict[str, Tuple[List[str], int]] = {}  # OUTPUT -> (support, table)
+        self.quads = quads
+        self.outputs = outputs
+        
+        if max_support:
+            analysis = SupportAnalyzer(quads, inputs, outputs, max_support).analyze()
+            for output in self.choose(analysis, max_support):
+                self.tables[output] = analysis.truth_table(output)
+            if self.tables:
+                self.outputs = [output for output in outputs if output not in self.tables]
+                self.quads = [quads[index] for index in analysis.cone(self.outputs)]
+        
+        # Constant names must not clash with any identifier in the circuit
+        self.prefix = free_prefix(prefix, circuit_identifiers(quads, inputs, outputs))
+        self.names = {output: f"{self.prefix}{index}" for index, output in enumerate(self.tables)}
+    
+    def choose(self, analysis: SupportAnalyzer, max_support: int) -> List[str]:
+        """
+        Return the OUTPUTs worth a table. A table only saves the gates of
+        its cone that no OUTPUT evaluated by gates still needs, so OUTPUTs
+        whose saved gates cost no more than their lookup are dropped, their
+        cones become shared, and the rest are checked again until none is
+        dropped.
+        """
+        width: Dict[str, int] = {}
+        for output in self.outputs:
+            support = analysis.support.get(output)
+            if support is not None and len(support) <= max_support:
+                width[output] = len(support)
+        
+        cones = {output: analysis.cone([output]) for output in width}
+        shared = set(analysis.cone([output for output in self.outputs if output not in width]))
+        chosen = list(width)
+        while chosen:
+            dropped = set()
+            for output in chosen:
+                saved = sum(GATE_COST[self.quads[index].op]
+                            for index in cones[output] if index not in shared)
+                if saved <= self.lookup_cost(width[output]):
+                    dropped.add(output)
+            if not dropped:
+                break
+            for output in dropped:
+                shared.update(cones[output])
+            chosen = [output for output in chosen if output not in dropped]
+        return chosen
+    
+    @staticmethod
+    def lookup_cost(width: int) -> int:
+        """
+        Return the operations reading a table over width support INPUTs:
+        a shift and an OR per INPUT to build the row index, then a shift
+        and a mask (and a subscript and two more for bytes tables).
+        """
+        if width == 0:
+            return 0
+        cost = 2 * width
+        return cost if 1 << width <= INT_TABLE_ROWS else cost + 3
+    
+    def constant(self, output: str) -> str:
+        """Return the module-level name of an OUTPUT's bytes table."""
+        return self.names[output]
+    
+    def row_variable(self) -> str:
+        """Return the local variable holding a row index."""
+        return f"{self.prefix}_row"
+    
+    def constants(self) -> List[Tuple[str, bytes]]:
+        """Return (name, data) for every table stored as a bytes constant."""
+        constants = []
+        for output, (support, table) in self.tables.items():
+            rows = 1 << len(support)
+            if rows > INT_TABLE_ROWS:
+                constants.append((self.constant(output), table.to_bytes(rows // 8, 'little')))
+        return constants
+
+
+class SimulatorGenerator:
+    """
+    Setup shared by the Python backends (CodeGenerator, ASTCodeGenerator).
+    
+    reuse_registers renames wires to reused slots (RegisterAllocator),
+    chunk_size splits larger circuits into chunk functions (Chunker; 0 never
+    splits) and lookup_support reads OUTPUTs with at most that many support
+    INPUTs from truth tables in simulate() (LookupTables; 0 never does).
+    """
     
-    def __init__(self, quads: List[Quadruple], symbol_table: dict, circuit_name: str):
+    def __init__(self, quads: List[Quadruple], symbol_table: SymbolTable, circuit_name: str,
+                 reuse_registers: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 lookup_support: int = DEFAULT_LOOKUP_SUPPORT):
         self.quads = quads
         self.symbol_table = symbol_table
         self.circuit_name = circuit_name
+        self.registers: List[str] = []  # Slot variables, when reuse_registers is set
+        self.plan = None  # Chunker, when the circuit is split into chunks
+        
+        inputs = self.get_inputs()
+        outputs = self.get_outputs()
+        if chunk_size and len(quads) > chunk_size:
+            self.quads = Chunker.order(quads, outputs)
+        if reuse_registers:
+            allocator = RegisterAllocator(self.quads, inputs + outputs)
+            self.quads = allocator.allocate()
+            self.registers = allocator.registers()
+        
+        # Names the generated code adds must not clash with circuit identifiers
+        self.identifiers = circuit_identifiers(self.quads, inputs, outputs)
+        self.mask = free_name('_mask', self.identifiers)  # Row mask of simulate_packed()
+        self.values = free_name('_v', self.identifiers)  # Chunk value list
+        self.chunk_prefix = {name: free_prefix(f"_{name}_", self.identifiers)  # Chunk functions
+                             for name in ('simulate', 'simulate_packed', 'simulate_batch')}
+        
+        if chunk_size and len(self.quads) > chunk_size:
+            self.plan = Chunker(self.quads, inputs, outputs, chunk_size).plan()
+        
+        # simulate() evaluates only the cones of OUTPUTs without a table
+        self.lookups = LookupTables(self.quads, inputs, outputs, lookup_support)
+        self.simulate_plan = self.plan
+        if self.lookups.tables:
+            self.simulate_plan = None
+            if chunk_size and len(self.lookups.quads) > chunk_size:
+                self.simulate_plan = Chunker(self.lookups.quads, inputs, self.lookups.outputs,
+                                             chunk_size).plan()
     
     def get_inputs(self) -> List[str]:
         """Get all INPUT identifiers."""
-        return [
-            name for name, info in self.symbol_table.items()
-            if info.category == 'INPUT'
-        ]
+        return self.symbol_table.names_in('INPUT')
     
     def get_outputs(self) -> List[str]:
         """Get all OUTPUT identifiers."""
-        return [
-            name for name, info in self.symbol_table.items()
-            if info.category == 'OUTPUT'
-        ]
+        return self.symbol_table.names_in('OUTPUT')
+
+
+class CodeGenerator(SimulatorGenerator):
+    """
+    Generates Python code from quadruples, written line by line to a text
+    sink (generate() collects it into a string).
+    """
+    
+    def __init__(self, quads: List[Quadruple], symbol_table: SymbolTable, circuit_name: str,
+                 reuse_registers: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 lookup_support: int = DEFAULT_LOOKUP_SUPPORT):
+        super().__init__(quads, symbol_table, circuit_name, reuse_registers, chunk_size,
+                         lookup_support)
+        self.rows = {register: row for row, register in enumerate(self.registers)}
+        self.batch = {name: free_name(name, self.identifiers)  # Locals of simulate_batch()
+                      for name in ('np', 'inputs', 'packed', 'columns', '_zero', '_one', '_work',
+                                   'result')}
     
     def generate_operation(self, quad: Quadruple) -> str:
         """Convert a quadruple to Python code."""
@@ -55,58 +558,332 @@ class CodeGenerator:
         
         return ""
     
-    def generate_truth_table(self, inputs: List[str], outputs: List[str]) -> str:
-        """Generate code to print truth table."""
-        code = "# Truth Table\n"
-        input_header = '  '.join(inputs)
-        output_header = '  '.join(outputs)
-        code += f'print("{input_header} || {output_header}")\n'
-        code += 'print("-" * 40)\n\n'
+    def bitwise_operand(self, operand: str, ones: str, zero: str) -> str:
+        """Render an operand for bitwise evaluation, mapping constants to masks."""
+        if operand == '1':
+            return ones
+        if operand == '0':
+            return zero
+        return operand
+    
+    def generate_bitwise_operation(self, quad: Quadruple, ones: Optional[str] = None,
+                                   zero: str = '0') -> str:
+        """
+        Convert a quadruple to Python code over bit vectors.
         
-        num_inputs = len(inputs)
-        for i in range(2 ** num_inputs):
-            # Generate binary values
-            values = format(i, f'0{num_inputs}b')
-            args = ', '.join(values)
+        NOT is an XOR with the all-ones value, so the same code works for
+        packed integers (ones = row mask, the default) and for NumPy arrays
+        (ones = ~0).
+        """
+        ones = ones or self.mask
+        arg1 = self.bitwise_operand(quad.arg1, ones, zero)
+        arg2 = self.bitwise_operand(quad.arg2, ones, zero) if quad.arg2 is not None else None
+        
+        if quad.op == 'ASSIGN':
+            return f"    {quad.result} = {arg1}\n"
+        
+        elif quad.op == 'NOT':
+            return f"    {quad.result} = {arg1} ^ {ones}\n"
+        
+        elif quad.op == 'AND':
+            return f"    {quad.result} = {arg1} & {arg2}\n"
+        
+        elif quad.op == 'OR':
+            return f"    {quad.result} = {arg1} | {arg2}\n"
+        
+        elif quad.op == 'XOR':
+            return f"    {quad.result} = {arg1} ^ {arg2}\n"
+        
+        elif quad.op == 'NAND':
+            return f"    {quad.result} = ({arg1} & {arg2}) ^ {ones}\n"
+        
+        elif quad.op == 'NOR':
+            return f"    {quad.result} = ({arg1} | {arg2}) ^ {ones}\n"
+        
+        return ""
+    
+    def generate_inplace_operation(self, quad: Quadruple, ones: str, zero: str) -> str:
+        """
+        Convert a quadruple writing a slot's work array to in-place NumPy
+        code, so no temporary array is allocated per gate.
+        """
+        target = quad.result
+        np = self.batch['np']
+        arg1 = self.bitwise_operand(quad.arg1, ones, zero)
+        arg2 = self.bitwise_operand(quad.arg2, ones, zero) if quad.arg2 is not None else None
+        
+        if quad.op == 'ASSIGN':
+            return f"    {np}.copyto({target}, {arg1})\n"
+        
+        elif quad.op == 'NOT':
+            return f"    {np}.bitwise_xor({arg1}, {ones}, out={target})\n"
+        
+        elif quad.op in ('AND', 'OR', 'XOR'):
+            return f"    {np}.bitwise_{quad.op.lower()}({arg1}, {arg2}, out={target})\n"
+        
+        elif quad.op in ('NAND', 'NOR'):
+            ufunc = 'bitwise_and' if quad.op == 'NAND' else 'bitwise_or'
+            return (f"    {np}.{ufunc}({arg1}, {arg2}, out={target})\n"
+                    f"    {np}.bitwise_xor({target}, {ones}, out={target})\n")
+        
+        return ""
+    
+    def generate_batch_operation(self, quad: Quadruple) -> str:
+        """Convert a quadruple to NumPy code for simulate_batch()."""
+        batch = self.batch
+        if quad.result in self.rows:
+            return self.generate_inplace_operation(quad, ones=batch['_one'], zero=batch['_zero'])
+        if quad.op == 'ASSIGN' and quad.arg1 in self.rows:
+            # The slot is overwritten later, so an OUTPUT needs its own copy
+            return f"    {quad.result} = {quad.arg1}.copy()\n"
+        return self.generate_bitwise_operation(quad, ones=batch['_one'], zero=batch['_zero'])
+    
+    def generate_chunks(self, out: TextIO, plan: Chunker, name: str, params: List[str],
+                        operation: Callable[[Quadruple], str], views: bool = False):
+        """
+        Write one function _<name>_<i>(_v, *params) per chunk. It loads the
+        values earlier chunks computed from the list _v, evaluates its quadruples and stores
+        the values later chunks or the driver read back into _v. With views,
+        slots are rows of _work and are bound from it instead of passed in _v.
+        """
+        rows = self.rows if views else {}
+        values = self.values
+        
+        for index, chunk in enumerate(plan.chunks):
+            out.write(f"def {self.chunk_prefix[name]}{index}({', '.join([values] + params)}):\n")
             
-            code += f'result = simulate({args})\n'
+            if rows:
+                used = {operand for quad in chunk
+                        for operand in (quad.arg1, quad.arg2, quad.result) if operand in rows}
+                for register in sorted(used, key=rows.__getitem__):
+                    out.write(f"    {register} = {self.batch['_work']}[{rows[register]}]\n")
             
-            # Handle single vs multiple outputs
-            if len(outputs) == 1:
-                values_str = '  '.join(values)
-                code += f'print(f"{values_str} || {{result}}")\n'
-            else:
-                output_str = '  '.join([f'{{result[{j}]}}' for j in range(len(outputs))])
-                values_str = '  '.join(values)
-                code += f'print(f"{values_str} || {output_str}")\n'
+            for value, slot in plan.loads[index]:
+                if value not in rows:
+                    out.write(f"    {value} = {values}[{slot}]\n")
+            
+            for quad in chunk:
+                out.write(operation(quad))
+            
+            for value, slot in plan.stores[index]:
+                if value not in rows:
+                    out.write(f"    {values}[{slot}] = {value}\n")
+            out.write("\n")
+    
+    def generate_body(self, out: TextIO, quads: List[Quadruple], plan: Optional[Chunker],
+                      name: str, params: List[str], operation: Callable[[Quadruple], str]):
+        """
+        Write the gate evaluation of a simulator: its quadruples inline, or
+        calls to its chunk functions followed by reading the OUTPUTs from _v.
+        """
+        if plan is None:
+            for quad in quads:
+                out.write(operation(quad))
+            return
+        
+        values = self.values
+        inputs = set(plan.inputs)
+        entry = [value if value in inputs else 'None' for value in plan.entry]
+        spare = plan.size - len(entry)
+        out.write(f"    {values} = [{', '.join(entry)}]" + (f" + [None] * {spare}\n" if spare else "\n"))
+        
+        for index in range(len(plan.chunks)):
+            out.write(f"    {self.chunk_prefix[name]}{index}({', '.join([values] + params)})\n")
         
-        return code
+        for output, slot in zip(plan.outputs, plan.results):
+            out.write(f"    {output} = {values}[{slot}]\n")
     
-    def generate(self) -> str:
-        """Generate complete Python code."""
-        inputs = self.get_inputs()
-        outputs = self.get_outputs()
+    def generate_return(self, out: TextIO, outputs: List[str]):
+        """Write the return statement of a simulator function."""
+        if len(outputs) == 1:
+            out.write(f"    return {outputs[0]}\n\n")
+        else:
+            out.write(f"    return {', '.join(outputs)}\n\n")
+    
+    def generate_packed_simulate(self, out: TextIO, inputs: List[str], outputs: List[str]):
+        """
+        Generate simulate_packed(), which evaluates every row of the truth
+        table at once. Each argument holds one bit per row, and the last
+        argument (self.mask, normally _mask) has one set bit per row so
+        NOT/NAND/NOR stay within the row range.
+        """
+        if self.plan is not None:
+            self.generate_chunks(out, self.plan, 'simulate_packed', [self.mask],
+                                 self.generate_bitwise_operation)
+        
+        params = ', '.join(inputs + [self.mask])
+        out.write(f"def simulate_packed({params}):\n")
+        self.generate_body(out, self.quads, self.plan, 'simulate_packed', [self.mask],
+                           self.generate_bitwise_operation)
+        self.generate_return(out, outputs)
+    
+    def generate_batch_simulate(self, out: TextIO, inputs: List[str], outputs: List[str]):
+        """
+        Generate simulate_batch(), which evaluates the circuit column-wise
+        over a 2-D NumPy array with one row per test vector.
         
-        code = f"# Generated by Logic Gate Architect Compiler\n"
-        code += f"# Circuit: {self.circuit_name}\n\n"
+        bool/uint8 inputs hold one 0/1 value per cell and come back in the
+        same dtype; uint64 inputs hold 64 packed vectors per word and come
+        back as uint64 words. NumPy is imported only when the function runs.
+        """
+        names = self.batch
+        np, columns = names['np'], names['columns']
+        params = [np, names['_one'], names['_zero']] + ([names['_work']] if self.registers else [])
+        if self.plan is not None:
+            self.generate_chunks(out, self.plan, 'simulate_batch', params,
+                                 self.generate_batch_operation, views=True)
         
-        # Function definition
-        code += f"def simulate({', '.join(inputs)}):\n"
+        inputs_array, packed, result = names['inputs'], names['packed'], names['result']
+        out.write(f"def simulate_batch({inputs_array}):\n")
+        out.write('    """Simulate one vector per row of inputs; returns one column per output."""\n')
+        out.write(f"    import numpy as {np}\n")
+        out.write(f"    {inputs_array} = {np}.asarray({inputs_array})\n")
+        out.write(f"    if {inputs_array}.ndim != 2 or {inputs_array}.shape[1] != {len(inputs)}:\n")
+        out.write(f"        raise ValueError(\"simulate_batch expects an array of shape (n, {len(inputs)})\")\n")
+        out.write(f"    {packed} = {inputs_array}.dtype == {np}.uint64\n")
+        out.write(f"    {columns} = {np}.ascontiguousarray(({inputs_array} if {packed} "
+                  f"else {inputs_array}.astype(bool)).T)\n")
+        out.write(f"    {names['_zero']} = {np}.zeros({columns}.shape[1], dtype={columns}.dtype)\n")
+        out.write(f"    {names['_one']} = ~{names['_zero']}\n")
         
-        # Gate operations
-        for quad in self.quads:
-            code += self.generate_operation(quad)
+        for i, name in enumerate(inputs):
+            out.write(f"    {name} = {columns}[{i}]\n")
         
-        # Return statement
+        # One work array row per slot bounds memory by the live wire count
+        if self.registers:
+            work = names['_work']
+            out.write(f"    {work} = {np}.empty(({len(self.registers)}, {columns}.shape[1]), "
+                      f"dtype={columns}.dtype)\n")
+            if self.plan is None:
+                for i, register in enumerate(self.registers):
+                    out.write(f"    {register} = {work}[{i}]\n")
+        
+        self.generate_body(out, self.quads, self.plan, 'simulate_batch', params,
+                           self.generate_batch_operation)
+        
+        out.write(f"    {result} = {np}.stack([{', '.join(outputs)}], axis=1)\n")
+        out.write(f"    return {result} if {packed} else {result}.astype({inputs_array}.dtype)\n\n")
+    
+    def generate_truth_table(self, out: TextIO, inputs: List[str], outputs: List[str]):
+        """
+        Generate code to print the truth table.
+        
+        Input i is packed into an integer whose bit r is the value of that
+        input in row r, so the circuit is evaluated once by simulate_packed()
+        and the rows are decoded from the packed outputs as they are printed.
+        Circuits with more than TRUTH_TABLE_MAX_INPUTS INPUTs only print a
+        note, since their table could not be evaluated or printed anyway.
+        """
+        num_inputs = len(inputs)
+        
+        out.write("# Truth Table (bit-parallel: one packed bit per row)\n")
+        if num_inputs > TRUTH_TABLE_MAX_INPUTS:
+            out.write(f'print("Truth table omitted: {num_inputs} inputs '
+                      f'(limit {TRUTH_TABLE_MAX_INPUTS})")\n')
+            return
+        
+        input_header = '  '.join(inputs)
+        output_header = '  '.join(outputs)
+        out.write(f'print("{input_header} || {output_header}")\n')
+        out.write('print("-" * 40)\n\n')
+        
+        out.write("def print_truth_table():\n")
+        out.write(f"    rows = 1 << {num_inputs}\n")
+        out.write("    mask = (1 << rows) - 1\n")
+        
+        # Input i (most significant first) toggles every w = 2**(n-1-i) rows:
+        # mask // (2**w + 1) repeats w zeros then w ones, shifted into place.
+        packed_args = []
+        for i in range(num_inputs):
+            width = f"(1 << {num_inputs - 1 - i})"
+            out.write(f"    in{i} = mask // ((1 << {width}) + 1) << {width}\n")
+            packed_args.append(f"in{i}")
+        packed_args.append("mask")
+        
+        call = f"simulate_packed({', '.join(packed_args)})"
         if len(outputs) == 1:
-            code += f"    return {outputs[0]}\n\n"
+            out.write(f"    packed = ({call},)\n")
         else:
-            code += f"    return {', '.join(outputs)}\n\n"
+            out.write(f"    packed = {call}\n")
         
-        # Truth table
-        code += self.generate_truth_table(inputs, outputs)
+        # One string per output with character r holding row r
+        out.write("    columns = [format(value, f'0{rows}b')[::-1] for value in packed]\n")
+        out.write("    for row in range(rows):\n")
+        if num_inputs:
+            out.write(f"        values = '  '.join(format(row, '0{num_inputs}b'))\n")
+        else:
+            out.write("        values = ''\n")
+        out.write("        results = '  '.join(column[row] for column in columns)\n")
+        out.write('        print(f"{values} || {results}")\n\n')
+        out.write("print_truth_table()\n")
+    
+    def generate_header(self, out: TextIO):
+        """Write the banner comment that opens every generated module."""
+        out.write("# Generated by Logic Gate Architect Compiler\n")
+        out.write(f"# Circuit: {self.circuit_name}\n\n")
+    
+    def generate_lookup(self, out: TextIO, output: str,
+                        row_support: Optional[List[str]]) -> Optional[List[str]]:
+        """
+        Write the statements reading output from its truth table. The row
+        variable is only recomputed when its support differs from
+        row_support; returns the support the row variable now holds.
+        """
+        support, table = self.lookups.tables[output]
+        if not support:
+            out.write(f"    {output} = {table & 1}\n")
+            return row_support
+        
+        row = ' | '.join(name if j == 0 else f"{name} << {j}" for j, name in enumerate(support))
+        if 1 << len(support) <= INT_TABLE_ROWS:
+            out.write(f"    {output} = {table:#x} >> ({row}) & 1\n")
+            return row_support
+        
+        index = self.lookups.row_variable()
+        if support != row_support:
+            out.write(f"    {index} = {row}\n")
+        out.write(f"    {output} = {self.lookups.constant(output)}[{index} >> 3] >> ({index} & 7) & 1\n")
+        return support
+    
+    def generate_simulate(self, out: TextIO, inputs: List[str], outputs: List[str]):
+        """Generate simulate(), which evaluates one input vector."""
+        constants = self.lookups.constants()
+        for name, data in constants:
+            out.write(f"{name} = bytes.fromhex('{data.hex()}')\n")
+        if constants:
+            out.write("\n")
         
-        return code
+        if self.simulate_plan is not None:
+            self.generate_chunks(out, self.simulate_plan, 'simulate', [], self.generate_operation)
+        
+        out.write(f"def simulate({', '.join(inputs)}):\n")
+        self.generate_body(out, self.lookups.quads, self.simulate_plan, 'simulate', [],
+                           self.generate_operation)
+        row_support = None
+        for output in self.lookups.tables:
+            row_support = self.generate_lookup(out, output, row_support)
+        self.generate_return(out, outputs)
+    
+    def write(self, out: TextIO):
+        """Write the complete Python module to a text sink."""
+        inputs = self.get_inputs()
+        outputs = self.get_outputs()
+        
+        self.generate_header(out)
+        self.generate_simulate(out, inputs, outputs)
+        
+        # Bit-parallel and NumPy batch simulators
+        self.generate_packed_simulate(out, inputs, outputs)
+        self.generate_batch_simulate(out, inputs, outputs)
+        
+        # Truth table
+        self.generate_truth_table(out, inputs, outputs)
+    
+    def generate(self) -> str:
+        """Generate complete Python code as a string."""
+        out = io.StringIO()
+        self.write(out)
+        return out.getvalue()
 
 
 if __name__ == "__main__":
@@ -1,28 +1,428 @@
 #!/usr/bin/env python3
 """
 Logic Gate Architect Compiler - Main CLI Driver
-Complete 6-phase compiler implementation.
+Complete 6-phase compiler implementation. compile_source() is the
+side-effect-free library entry point; compile_file() and main() wrap it
+with console and file output.
 """
 
 import sys
 import argparse
+import json
 import os
+import tempfile
+import time
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
 
-from lexer import Lexer
-from parser import Parser
-from semantic import SemanticAnalyzer
-from icg import IntermediateCodeGenerator
+from lexer import Lexer, Token
+from parser import Parser, Program
+from semantic import SemanticAnalyzer, SymbolTable
+from icg import IntermediateCodeGenerator, Quadruple, QuadTable
 from optimizer import Optimizer
-from codegen import CodeGenerator
+from codegen import CodeGenerator, DEFAULT_CHUNK_SIZE, DEFAULT_LOOKUP_SUPPORT
+from astgen import ASTCodeGenerator, dump_code, load_code, load_functions
+from cgen import CCodeGenerator, DEFAULT_NATIVE_DIR, NativeBuildError, NativeSimulator, load_native
+from cache import CompileCache
+from profiler import PhaseProfiler
+
+
+__version__ = "1.1.0"
+
+
+def parse_fixed_inputs(text: str) -> Dict[str, str]:
+    """
+    Parse a --fix specification such as "SEL0=1,SEL1=0".
+    
+    Raises:
+        ValueError: If an entry is not of the form NAME=VALUE
+    """
+    fixed = {}
+    for entry in text.split(','):
+        name, sep, value = entry.partition('=')
+        if not sep or not name.strip() or not value.strip():
+            raise ValueError(f"Invalid --fix entry '{entry}': expected NAME=0 or NAME=1")
+        fixed[name.strip()] = value.strip()
+    return fixed
+
+
+@dataclass
+class CompileOptions:
+    """Options for compile_source()."""
+    optimize: bool = True
+    fixed: Optional[Dict[str, str]] = None  # INPUT values to specialize for
+    outputs: Optional[List[str]] = None  # Compile only these OUTPUTs' cone
+    cache: Optional[CompileCache] = None  # Skip all phases for unchanged sources
+    sink: Optional[TextIO] = None  # Stream the code here instead of into CompileResult.code
+    profiler: Optional[PhaseProfiler] = None  # Record time and memory per phase and sub-pass
+    target: str = 'source'  # 'source' for Python text, 'code' for an in-memory code object, 'native' for C
+    reuse_registers: bool = False  # Store wires in reused slots chosen by liveness
+    chunk_size: int = DEFAULT_CHUNK_SIZE  # Quadruples per generated function (0: no chunks)
+    lookup_support: int = DEFAULT_LOOKUP_SUPPORT  # simulate() reads OUTPUTs on this many INPUTs from tables
+    native_dir: str = DEFAULT_NATIVE_DIR  # Where target 'native' keeps built libraries
+
+
+@dataclass
+class CompileResult:
+    """
+    Structured result of compile_source().
+    
+    Phases run in order and stop at the first failure, so every field for a
+    phase after failed_phase is None. On a cache hit only circuit,
+    optimized_symbol_table, optimized_quads and the phase 6 output are
+    filled in. code is None when the options gave a sink, since the code
+    was written there. With target 'code', code_object and simulate are set
+    instead of code, and with target 'native', c_source, native and simulate.
+    """
+    success: bool = False
+    errors: List[str] = field(default_factory=list)
+    failed_phase: Optional[str] = None  # 'lexical', 'syntax', 'semantic', 'icg', 'optimization' or 'codegen'
+    cached: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)  # Seconds per phase, in run order
+    circuit: Optional[str] = None
+    tokens: Optional[List[Token]] = None
+    ast: Optional[Program] = None
+    symbol_table: Optional[SymbolTable] = None
+    quads: Optional[List[Quadruple]] = None
+    optimized_quads: Optional[List[Quadruple]] = None
+    cone_size: Optional[int] = None  # Quadruples left after --fix/--outputs
+    optimized_symbol_table: Optional[SymbolTable] = None  # After --fix/--outputs
+    code: Optional[str] = None
+    code_object: Optional[CodeType] = None  # Defines simulate() and simulate_packed()
+    c_source: Optional[str] = None  # C99 source defining simulate_words()
+    native: Optional[NativeSimulator] = None  # Binding of the library built from c_source
+    simulate: Optional[Callable] = None  # Ready to call, from code_object or native
+
+
+
+def generate_code(result: CompileResult, options: CompileOptions,
+                  entry: Dict[str, Any] = None):
+    """
+    Phase 6: fill in result's code for options.target, reusing what a
+    cache entry stored when it has output for that target (entries hold
+    only what the compile that wrote them produced).
+    """
+    if options.target == 'native':
+        c_source = entry.get('c_source') if entry else None
+        if c_source is None:
+            c_source = CCodeGenerator(result.optimized_quads, result.optimized_symbol_table,
+                                      result.circuit, options.chunk_size).generate()
+        result.c_source = c_source
+        result.native = load_native(c_source, result.optimized_symbol_table, options.native_dir)
+        result.simulate = result.native.simulate
+        return
+    
+    if options.target == 'code':
+        stored = entry.get('code_object') if entry else None
+        code_object = load_code(stored) if stored else None
+        if code_object is None:
+            code_object = ASTCodeGenerator(result.optimized_quads, result.optimized_symbol_table,
+                                           result.circuit, options.reuse_registers,
+                                           options.chunk_size, options.lookup_support).generate()
+        result.code_object = code_object
+        result.simulate = load_functions(code_object)['simulate']
+        return
+    
+    code = entry['code'] if entry else None
+    if code is None:
+        codegen = CodeGenerator(result.optimized_quads, result.optimized_symbol_table, result.circuit,
+                                options.reuse_registers, options.chunk_size, options.lookup_support)
+        if options.sink is not None:
+            codegen.write(options.sink)
+        else:
+            result.code = codegen.generate()
+    elif options.sink is not None:
+        options.sink.write(code)
+    else:
+        result.code = code
+
+
+def compile_source(source_code: str, options: CompileOptions = None) -> CompileResult:
+    """
+    Compile circuit source text through all 6 phases without any I/O.
+    
+    Compilation errors are reported in the result rather than raised or
+    printed, so the compiler can be embedded in other programs.
+    
+    Args:
+        source_code: Logic Gate Architect source text
+        options: Compile options (defaults to a plain optimized compile)
+        
+    Returns:
+        CompileResult holding every phase's output
+    """
+    options = options or CompileOptions()
+    result = CompileResult()
+    clock = time.perf_counter()
+    
+    def lap(phase: str):
+        nonlocal clock
+        now = time.perf_counter()
+        result.timings[phase] = result.timings.get(phase, 0.0) + now - clock
+        clock = now
+    
+    def phase(name: str):
+        if options.profiler is None:
+            return nullcontext()
+        return options.profiler.phase(name)
+    
+    cache_key = None
+    if options.cache is not None:
+        cache_key = options.cache.key(source_code, __version__, {
+            'no_optimize': not options.optimize,
+            'fixed': sorted(options.fixed.items()) if options.fixed else None,
+            'outputs': options.outputs,
+            'reuse_registers': options.reuse_registers,
+            'chunk_size': options.chunk_size,
+            'lookup_support': options.lookup_support,
+        })
+        with phase('cache'):
+            entry = options.cache.get(cache_key)
+        lap('cache')
+        if entry is not None:
+            result.cached = True
+            result.circuit = entry['circuit']
+            result.optimized_symbol_table = entry['symbol_table']
+            result.optimized_quads = entry['quads'].to_quads()
+            result.cone_size = entry.get('source_quads')
+            try:
+                generate_code(result, options, entry)
+            except NativeBuildError as e:
+                result.errors.append(str(e))
+                result.failed_phase = 'codegen'
+                return result
+            result.success = True
+            lap('cache')
+            return result
+    
+    # Phase 1: Lexical Analysis
+    with phase('lexical'):
+        try:
+            result.tokens = Lexer().tokenize(source_code)
+        except SyntaxError as e:
+            result.errors.append(str(e))
+            result.failed_phase = 'lexical'
+            return result
+    lap('lexical')
+    
+    # Phase 2: Syntax Analysis
+    with phase('syntax'):
+        try:
+            result.ast = Parser(result.tokens).parse_program()
+        except SyntaxError as e:
+            result.errors.append(str(e))
+            result.failed_phase = 'syntax'
+            return result
+    result.circuit = result.ast.name
+    lap('syntax')
+    
+    # Phase 3: Semantic Analysis
+    with phase('semantic'):
+        semantic_result = SemanticAnalyzer(result.ast).analyze()
+    result.symbol_table = semantic_result['symbol_table']
+    if not semantic_result['success']:
+        result.errors.extend(semantic_result['errors'])
+        result.failed_phase = 'semantic'
+        return result
+    lap('semantic')
+    
+    # Phase 4: Intermediate Code Generation
+    with phase('icg'):
+        try:
+            result.quads = IntermediateCodeGenerator(result.ast).generate()
+        except ValueError as e:
+            result.errors.append(str(e))
+            result.failed_phase = 'icg'
+            return result
+    lap('icg')
+    
+    # Phase 5: Optimization (specialization and cone extraction run even
+    # when optimization is disabled, since they change the interface)
+    with phase('optimization'):
+        optimizer = Optimizer(result.quads, result.symbol_table, options.profiler)
+        try:
+            if options.fixed:
+                optimizer.specialize(options.fixed)
+            if options.outputs:
+                optimizer.extract_cone(options.outputs)
+        except ValueError as e:
+            result.errors.append(str(e))
+            result.failed_phase = 'optimization'
+            return result
+        result.cone_size = len(optimizer.quads)
+        
+        result.optimized_quads = optimizer.optimize() if options.optimize else optimizer.quads
+        result.optimized_symbol_table = optimizer.symbol_table
+    lap('optimization')
+    
+    # Phase 6: Code Generation
+    with phase('codegen'):
+        try:
+            generate_code(result, options)
+        except NativeBuildError as e:
+            result.errors.append(str(e))
+            result.failed_phase = 'codegen'
+            return result
+    result.success = True
+    lap('codegen')
+    
+    if options.cache is not None:
+        with phase('cache'):
+            options.cache.put(cache_key, {
+                'circuit': result.circuit,
+                'quads': QuadTable.from_quads(result.optimized_quads),
+                'symbol_table': result.optimized_symbol_table,
+                'code': result.code,
+                'code_object': dump_code(result.code_object) if result.code_object else None,
+                'c_source': result.c_source,
+                'source_quads': result.cone_size,
+            })
+        lap('cache')
+    
+    return result
+
+
+def resolve_output_path(output_file: str) -> Path:
+    """
+    Return where output_file is written, creating its directory.
+    Relative paths are placed in the outputs/ folder.
+    """
+    # Create outputs directory if it doesn't exist
+    outputs_dir = Path("outputs")
+    outputs_dir.mkdir(exist_ok=True)
+    
+    # If output_file is not an absolute path, save it in outputs folder
+    output_path = Path(output_file)
+    if not output_path.is_absolute():
+        output_path = outputs_dir / output_path.name
+    
+    # Ensure the directory exists (in case of nested paths)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    return output_path
+
+
+def save_code(python_code: str, output_file: str) -> Path:
+    """
+    Write generated code to output_file and return the path written.
+    Relative paths are placed in the outputs/ folder.
+    """
+    output_path = resolve_output_path(output_file)
+    with open(output_path, 'w') as f:
+        f.write(python_code)
+    return output_path
+
+
+def compile_to_file(source_code: str, options: CompileOptions,
+                    output_file: str) -> Tuple[CompileResult, Optional[Path]]:
+    """
+    Compile source text and stream the generated code straight into
+    output_file, without holding the whole module in memory.
+    
+    The code is written to a temporary file that replaces output_file only
+    when compilation succeeds, so a failed compile leaves any previous
+    output untouched.
+    
+    Returns:
+        (result, path written), where the path is None on failure
+    """
+    output_path = resolve_output_path(output_file)
+    fd, temp_path = tempfile.mkstemp(dir=output_path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            result = compile_source(source_code, replace(options, sink=f))
+        if not result.success:
+            Path(temp_path).unlink()
+            return result, None
+        os.replace(temp_path, output_path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    return result, output_path
+
+
+def report_success(python_code: str, output_file: str = None):
+    """Print the generated code and save it to output_file if given."""
+    print("\n" + "=" * 60)
+    print("COMPILATION SUCCESSFUL")
+    print("=" * 60)
+    print("\n--- Generated Python Code ---\n")
+    print(python_code)
+    
+    # Save to file if specified
+    if output_file:
+        output_path = save_code(python_code, output_file)
+        print(f"\n[OK] Code saved to: {output_path}")
+        print(f"  Run with: python {output_path}")
+
+
+def summarize(input_file: str, result: CompileResult, output_path: Path = None) -> Dict[str, Any]:
+    """
+    Build the compact --quiet / --format json record for one compilation.
+    
+    Returns:
+        JSON-serializable dict with the status, per-phase timings in
+        milliseconds, quadruple counts before and after optimization, and
+        the output path or errors
+    """
+    record = {
+        'file': input_file,
+        'status': 'ok' if result.success else 'error',
+        'circuit': result.circuit,
+        'cached': result.cached,
+        'timings_ms': {phase: round(seconds * 1000, 3) for phase, seconds in result.timings.items()},
+        'total_ms': round(sum(result.timings.values()) * 1000, 3),
+    }
+    if result.success:
+        record['quads_before'] = result.cone_size
+        record['quads_after'] = len(result.optimized_quads)
+        record['output'] = str(output_path)
+    else:
+        record['phase'] = result.failed_phase
+        record['errors'] = result.errors
+    return record
+
+
+def print_summary(record: Dict[str, Any]):
+    """Print a summary record from summarize() as two lines of text."""
+    if record['status'] == 'ok':
+        cached = ', cached' if record['cached'] else ''
+        print(f"[OK] {record['file']}: {record['circuit']}, "
+              f"{record['quads_before']} -> {record['quads_after']} quadruples, "
+              f"{record['total_ms']:.3f} ms{cached} -> {record['output']}")
+    else:
+        print(f"[ERROR] {record['file']}: {record['phase']} phase failed")
+        for error in record['errors']:
+            print(f"  {error}")
+    print("  " + "  ".join(f"{phase} {ms:.3f} ms" for phase, ms in record['timings_ms'].items()))
+
+
+def print_profile(profiler: PhaseProfiler):
+    """Print the --profile table."""
+    print("\nPhase Profile:")
+    print(profiler.format_table())
+
+
+def print_phase_header(title: str):
+    """Print a verbose-mode phase banner."""
+    print("\n" + "=" * 60)
+    print(title)
+    print("=" * 60)
 
 
 def compile_file(input_file: str, output_file: str = None, verbose: bool = False, 
                  show_tokens: bool = False, show_ast: bool = False, 
                  show_symbols: bool = False, show_quads: bool = False,
-                 no_optimize: bool = False):
+                 no_optimize: bool = False, fixed: Dict[str, str] = None,
+                 outputs: List[str] = None, cache: CompileCache = None,
+                 summary: str = None, profiler: PhaseProfiler = None,
+                 reuse_registers: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 lookup_support: int = DEFAULT_LOOKUP_SUPPORT):
     """
-    Compile a circuit file through all 6 phases.
+    Compile a circuit file through all 6 phases and report on the console.
     
     Args:
         input_file: Path to input .gate file
@@ -33,179 +433,267 @@ def compile_file(input_file: str, output_file: str = None, verbose: bool = False
         show_symbols: Print symbol table
         show_quads: Print quadruples
         no_optimize: Disable optimization
+        fixed: INPUT values to specialize the circuit for, e.g. {'SEL': '1'}
+        outputs: Compile only the cone of influence of these OUTPUTs
+        cache: Compile cache; on a hit all six phases are skipped
+        summary: 'text' or 'json' to print only a compact summary instead of
+                 the phase reports and generated code; the code is written to
+                 output_file (default: outputs/<name>_output.py)
+        profiler: Records time and memory per phase; in summary mode the
+                  profile is reported with the summary
+        reuse_registers: Store wires in reused slots in the generated code
+        chunk_size: Quadruples per generated function; 0 keeps each
+                    simulator in one function
+        lookup_support: simulate() reads OUTPUTs depending on at most this
+                        many INPUTs from truth tables; 0 disables
+    
+    Returns:
+        0 on success, 1 on failure
     """
     try:
         # Read input file
         with open(input_file, 'r') as f:
             source_code = f.read()
-        
-        if verbose:
-            print(f"Reading source file: {input_file}\n")
-        
-        # Phase 1: Lexical Analysis
-        if verbose:
-            print("=" * 60)
-            print("Phase 1: Lexical Analysis")
-            print("=" * 60)
-        
-        lexer = Lexer()
-        tokens = lexer.tokenize(source_code)
-        
-        if verbose:
-            print(f"[OK] Phase 1: Lexical Analysis Complete ({len(tokens)} tokens)")
-        
-        if show_tokens:
-            print("\nToken Stream:")
-            for token in tokens:
-                print(f"  {token}")
-            print()
-        
-        # Phase 2: Syntax Analysis
-        if verbose:
-            print("\n" + "=" * 60)
-            print("Phase 2: Syntax Analysis")
-            print("=" * 60)
-        
-        parser = Parser(tokens)
-        ast = parser.parse_program()
-        
-        if verbose:
-            print(f"[OK] Phase 2: Syntax Analysis Complete")
-            print(f"  Circuit: {ast.name}")
-            print(f"  Declarations: {len(ast.declarations)}")
-            print(f"  Gates: {len(ast.gates)}")
-        
-        if show_ast:
-            print("\nAbstract Syntax Tree:")
-            print(f"  Program: {ast.name}")
-            print("  Declarations:")
-            for decl in ast.declarations:
-                print(f"    {decl}")
-            print("  Gates:")
-            for gate in ast.gates:
-                print(f"    {gate}")
-            print()
-        
-        # Phase 3: Semantic Analysis
-        if verbose:
-            print("\n" + "=" * 60)
-            print("Phase 3: Semantic Analysis")
-            print("=" * 60)
-        
-        analyzer = SemanticAnalyzer(ast)
-        semantic_result = analyzer.analyze()
-        
-        if not semantic_result['success']:
-            print("[ERROR] Semantic Errors Found:")
-            for error in semantic_result['errors']:
-                print(f"  {error}")
-            return 1
-        
-        if verbose:
-            print("[OK] Phase 3: Semantic Analysis Complete")
-            print(f"  Symbol table entries: {len(semantic_result['symbol_table'])}")
-        
-        if show_symbols:
-            print("\nSymbol Table:")
-            for name, info in semantic_result['symbol_table'].items():
-                used_by = ', '.join(info.used_by) if info.used_by else 'None'
-                print(f"  {name}: category={info.category}, defined={info.defined}, used_by=[{used_by}]")
-            print()
-        
-        # Phase 4: Intermediate Code Generation
-        if verbose:
-            print("\n" + "=" * 60)
-            print("Phase 4: Intermediate Code Generation")
-            print("=" * 60)
-        
-        icg = IntermediateCodeGenerator(ast)
-        quads = icg.generate()
-        
-        if verbose:
-            print(f"[OK] Phase 4: Intermediate Code Generated ({len(quads)} quadruples)")
-        
-        if show_quads:
-            print("\nQuadruples (Before Optimization):")
-            for i, quad in enumerate(quads, 1):
-                print(f"  {i}: {quad}")
-            print()
-        
-        # Phase 5: Optimization
-        if verbose:
-            print("\n" + "=" * 60)
-            print("Phase 5: Optimization")
-            print("=" * 60)
-        
-        if no_optimize:
-            optimized = quads
-            if verbose:
-                print("[WARN] Optimization disabled")
-        else:
-            optimizer = Optimizer(quads, semantic_result['symbol_table'])
-            optimized = optimizer.optimize()
-            
-            removed = len(quads) - len(optimized)
-            if verbose:
-                print(f"[OK] Phase 5: Optimization Complete ({removed} instructions removed)")
-        
-        if show_quads and not no_optimize:
-            print("\nQuadruples (After Optimization):")
-            for i, quad in enumerate(optimized, 1):
-                print(f"  {i}: {quad}")
-            print()
-        
-        # Phase 6: Code Generation
-        if verbose:
-            print("\n" + "=" * 60)
-            print("Phase 6: Code Generation")
-            print("=" * 60)
-        
-        codegen = CodeGenerator(optimized, semantic_result['symbol_table'], ast.name)
-        python_code = codegen.generate()
-        
-        if verbose:
-            print("[OK] Phase 6: Code Generation Complete")
-        
-        # Output results
-        print("\n" + "=" * 60)
-        print("COMPILATION SUCCESSFUL")
-        print("=" * 60)
-        print("\n--- Generated Python Code ---\n")
-        print(python_code)
-        
-        # Save to file if specified
-        if output_file:
-            # Create outputs directory if it doesn't exist
-            outputs_dir = Path("outputs")
-            outputs_dir.mkdir(exist_ok=True)
-            
-            # If output_file is not an absolute path, save it in outputs folder
-            output_path = Path(output_file)
-            if not output_path.is_absolute():
-                output_path = outputs_dir / output_path.name
-            
-            # Ensure the directory exists (in case of nested paths)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w') as f:
-                f.write(python_code)
-            print(f"\n[OK] Code saved to: {output_path}")
-            print(f"  Run with: python {output_path}")
-        
-        return 0
-    
     except FileNotFoundError:
         print(f"Error: File '{input_file}' not found.")
         return 1
-    except SyntaxError as e:
-        print(f"Error: {e}")
-        return 1
+    
+    if verbose and not summary:
+        print(f"Reading source file: {input_file}")
+    
+    # Inspection flags need the phases to actually run
+    inspecting = not summary and (show_tokens or show_ast or show_symbols or show_quads)
+    options = CompileOptions(
+        optimize=not no_optimize,
+        fixed=fixed,
+        outputs=outputs,
+        cache=None if inspecting else cache,
+        profiler=profiler,
+        reuse_registers=reuse_registers,
+        chunk_size=chunk_size,
+        lookup_support=lookup_support,
+    )
+    
+    try:
+        if summary:
+            # The code is not echoed, so stream it straight to the file
+            result, output_path = compile_to_file(
+                source_code, options, output_file or Path(input_file).stem + "_output.py")
+        else:
+            result = compile_source(source_code, options)
     except Exception as e:
         print(f"Unexpected error: {e}")
         if verbose:
             import traceback
             traceback.print_exc()
         return 1
+    finally:
+        if profiler is not None:
+            profiler.close()
+    
+    if summary:
+        record = summarize(input_file, result, output_path)
+        if profiler is not None:
+            record['profile'] = profiler.to_dict()
+        if summary == 'json':
+            print(json.dumps(record))
+        else:
+            print_summary(record)
+            if profiler is not None:
+                print_profile(profiler)
+        return 0 if result.success else 1
+    
+    if result.cached:
+        if verbose:
+            print(f"\n[OK] Cache hit in {cache.directory}: phases 1-6 skipped")
+        report_success(result.code, output_file)
+        return 0
+    
+    # Phase 1: Lexical Analysis
+    if verbose:
+        print_phase_header("Phase 1: Lexical Analysis")
+    
+    if result.failed_phase == 'lexical':
+        print(f"Error: {result.errors[0]}")
+        return 1
+    
+    if verbose:
+        print(f"[OK] Phase 1: Lexical Analysis Complete ({len(result.tokens)} tokens)")
+    
+    if show_tokens:
+        print("\nToken Stream:")
+        for token in result.tokens:
+            print(f"  {token}")
+        print()
+    
+    # Phase 2: Syntax Analysis
+    if verbose:
+        print_phase_header("Phase 2: Syntax Analysis")
+    
+    if result.failed_phase == 'syntax':
+        print(f"Error: {result.errors[0]}")
+        return 1
+    
+    ast = result.ast
+    if verbose:
+        print(f"[OK] Phase 2: Syntax Analysis Complete")
+        print(f"  Circuit: {ast.name}")
+        print(f"  Declarations: {len(ast.declarations)}")
+        print(f"  Gates: {len(ast.gates)}")
+    
+    if show_ast:
+        print("\nAbstract Syntax Tree:")
+        print(f"  Program: {ast.name}")
+        print("  Declarations:")
+        for decl in ast.declarations:
+            print(f"    {decl}")
+        print("  Gates:")
+        for gate in ast.gates:
+            print(f"    {gate}")
+        print()
+    
+    # Phase 3: Semantic Analysis
+    if verbose:
+        print_phase_header("Phase 3: Semantic Analysis")
+    
+    if result.failed_phase == 'semantic':
+        print("[ERROR] Semantic Errors Found:")
+        for error in result.errors:
+            print(f"  {error}")
+        return 1
+    
+    if verbose:
+        print("[OK] Phase 3: Semantic Analysis Complete")
+        print(f"  Symbol table entries: {len(result.symbol_table)}")
+    
+    if show_symbols:
+        print("\nSymbol Table:")
+        for name, info in result.symbol_table.items():
+            used_by = ', '.join(info.used_by) if info.used_by else 'None'
+            print(f"  {name}: category={info.category}, defined={info.defined}, used_by=[{used_by}]")
+        print()
+    
+    # Phase 4: Intermediate Code Generation
+    if verbose:
+        print_phase_header("Phase 4: Intermediate Code Generation")
+    
+    if result.failed_phase == 'icg':
+        print(f"Error: {result.errors[0]}")
+        return 1
+    
+    if verbose:
+        print(f"[OK] Phase 4: Intermediate Code Generated ({len(result.quads)} quadruples)")
+    
+    if show_quads:
+        print("\nQuadruples (Before Optimization):")
+        for i, quad in enumerate(result.quads, 1):
+            print(f"  {i}: {quad}")
+        print()
+    
+    # Phase 5: Optimization
+    if verbose:
+        print_phase_header("Phase 5: Optimization")
+    
+    if result.failed_phase == 'optimization':
+        print(f"Error: {result.errors[0]}")
+        return 1
+    
+    if verbose:
+        if fixed:
+            pins = ', '.join(f"{name}={value}" for name, value in fixed.items())
+            print(f"[OK] Specialized for fixed inputs: {pins}")
+        if outputs:
+            print(f"[OK] Extracted cone of influence for: {', '.join(outputs)} "
+                  f"({result.cone_size} of {len(result.quads)} quadruples)")
+        if no_optimize:
+            print("[WARN] Optimization disabled")
+        else:
+            removed = len(result.quads) - len(result.optimized_quads)
+            print(f"[OK] Phase 5: Optimization Complete ({removed} instructions removed)")
+    
+    if show_quads and not no_optimize:
+        print("\nQuadruples (After Optimization):")
+        for i, quad in enumerate(result.optimized_quads, 1):
+            print(f"  {i}: {quad}")
+        print()
+    
+    # Phase 6: Code Generation
+    if verbose:
+        print_phase_header("Phase 6: Code Generation")
+        print("[OK] Phase 6: Code Generation Complete")
+    
+    # Output results
+    report_success(result.code, output_file)
+    
+    return 0
+
+
+def compile_batch_file(input_file: str, options: CompileOptions) -> Dict[str, Any]:
+    """
+    Compile one file of a batch; runs inside a worker process.
+    
+    The generated code is saved as outputs/<name>_output.py.
+    
+    Returns:
+        JSON-serializable record with file, status, seconds, and either the
+        output path or the error message
+    """
+    start = time.perf_counter()
+    try:
+        with open(input_file, 'r') as f:
+            source_code = f.read()
+        result, output_path = compile_to_file(source_code, options,
+                                              Path(input_file).stem + "_output.py")
+        errors = result.errors
+    except Exception as e:
+        result = None
+        errors = [f"Unexpected error: {e}"]
+    elapsed = time.perf_counter() - start
+    
+    record = {
+        'file': input_file,
+        'status': 'ok' if result and result.success else 'error',
+        'seconds': round(elapsed, 6),
+    }
+    if record['status'] == 'ok':
+        record['output'] = str(output_path)
+    else:
+        record['error'] = '; '.join(errors)
+    return record
+
+
+def compile_batch(directory: str, jobs: int = None, options: CompileOptions = None) -> int:
+    """
+    Compile every .gate file in a directory with a pool of worker processes.
+    
+    Each worker imports the compiler once and compiles many files, so the
+    interpreter start-up cost is paid per worker rather than per file. One
+    JSON status line is printed per file as it completes.
+    
+    Args:
+        directory: Directory containing .gate files
+        jobs: Number of worker processes (default: number of CPUs)
+        options: Compile options applied to every file
+    
+    Returns:
+        0 if every file compiled, 1 otherwise
+    """
+    files = sorted(str(path) for path in Path(directory).glob("*.gate"))
+    if not files:
+        print(f"Error: No .gate files found in '{directory}'.")
+        return 1
+    
+    options = options or CompileOptions()
+    failures = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(compile_batch_file, path, options) for path in files]
+        for future in as_completed(futures):
+            record = future.result()
+            if record['status'] != 'ok':
+                failures += 1
+            print(json.dumps(record), flush=True)
+    
+    return 1 if failures else 0
 
 
 def main():
@@ -219,10 +707,20 @@ Examples:
   python compiler.py circuit.gate -o output.py
   python compiler.py circuit.gate -v --tokens --ast
   python compiler.py circuit.gate -o output.py --no-optimize
+  python compiler.py circuit.gate --fix SEL0=1,SEL1=0
+  python compiler.py circuit.gate --outputs Sum,Cout
+  python compiler.py circuit.gate -o output.py --reuse-registers
+  python compiler.py circuit.gate -o output.py --chunk-size 500
+  python compiler.py circuit.gate -o output.py --lookup-support 8
+  python compiler.py circuit.gate -o output.py --cache
+  python compiler.py circuit.gate -o output.py --quiet
+  python compiler.py circuit.gate --format json
+  python compiler.py circuit.gate --quiet --profile --profile-dir prof
+  python compiler.py --batch examples -j 4
         """
     )
     
-    parser.add_argument('input_file', help='Input .gate file to compile')
+    parser.add_argument('input_file', nargs='?', help='Input .gate file to compile')
     parser.add_argument('-o', '--output', dest='output_file', 
                        help='Output Python file (default: print to stdout)')
     parser.add_argument('-v', '--verbose', action='store_true',
@@ -237,15 +735,77 @@ Examples:
                        help='Print quadruples')
     parser.add_argument('--no-optimize', action='store_true',
                        help='Disable optimization phase')
+    parser.add_argument('--fix', dest='fixed', metavar='NAME=VALUE,...',
+                       help='Specialize the circuit for fixed INPUT values, e.g. SEL0=1,SEL1=0')
+    parser.add_argument('--outputs', metavar='NAME,...',
+                       help='Compile only the cone of influence of these OUTPUTs, e.g. Sum,Cout')
+    parser.add_argument('--reuse-registers', action='store_true',
+                       help='Store wires in reused local slots chosen by liveness, for very large circuits')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, metavar='N',
+                       help=f'Split simulators into functions of N quadruples; 0 disables (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--lookup-support', type=int, default=DEFAULT_LOOKUP_SUPPORT, metavar='N',
+                       help=f'Read OUTPUTs depending on at most N INPUTs from truth tables in simulate(); 0 disables (default: {DEFAULT_LOOKUP_SUPPORT})')
+    parser.add_argument('--cache', action='store_true',
+                       help='Reuse results for unchanged sources from an on-disk compile cache')
+    parser.add_argument('--cache-dir', default='.gatecache', metavar='DIR',
+                       help='Compile cache directory (default: .gatecache)')
+    parser.add_argument('--cache-size', type=int, default=64, metavar='MB',
+                       help='Maximum cache size before least recently used entries are evicted (default: 64)')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Print only a one-line summary; the code is written to the output file')
+    parser.add_argument('--format', choices=['text', 'json'], default='text',
+                       help='Summary format; json implies --quiet (default: text)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Report wall time, CPU time and peak memory per phase and optimizer sub-pass')
+    parser.add_argument('--profile-dir', metavar='DIR',
+                       help='Also dump a cProfile file per phase to DIR; implies --profile')
+    parser.add_argument('--batch', metavar='DIR',
+                       help='Compile every .gate file in DIR in parallel, reporting JSON lines')
+    parser.add_argument('-j', '--jobs', type=int, metavar='N',
+                       help='Worker processes for --batch (default: number of CPUs)')
     
     args = parser.parse_args()
     
+    if args.batch and args.input_file:
+        parser.error("give either an input file or --batch DIR, not both")
+    if not args.batch and not args.input_file:
+        parser.error("an input file or --batch DIR is required")
+    if args.batch and (args.profile or args.profile_dir):
+        parser.error("--profile is not supported with --batch")
+    if args.chunk_size < 0:
+        parser.error("--chunk-size must be 0 or more")
+    if args.lookup_support < 0:
+        parser.error("--lookup-support must be 0 or more")
+    
+    try:
+        fixed = parse_fixed_inputs(args.fixed) if args.fixed else None
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    outputs = [name.strip() for name in args.outputs.split(',')] if args.outputs else None
+    cache = CompileCache(args.cache_dir, args.cache_size * 1024 * 1024) if args.cache else None
+    
+    if args.batch:
+        if not Path(args.batch).is_dir():
+            print(f"Error: Batch directory '{args.batch}' not found.")
+            return 1
+        options = CompileOptions(optimize=not args.no_optimize, fixed=fixed,
+                                 outputs=outputs, cache=cache,
+                                 reuse_registers=args.reuse_registers,
+                                 chunk_size=args.chunk_size,
+                                 lookup_support=args.lookup_support)
+        return compile_batch(args.batch, args.jobs, options)
+    
     # Check if input file exists
     if not Path(args.input_file).exists():
         print(f"Error: Input file '{args.input_file}' not found.")
         return 1
     
-    return compile_file(
+    profiler = PhaseProfiler(args.profile_dir) if args.profile or args.profile_dir else None
+    summary = 'json' if args.format == 'json' else 'text' if args.quiet else None
+    
+    status = compile_file(
         args.input_file,
         args.output_file,
         args.verbose,
@@ -253,8 +813,20 @@ Examples:
         args.show_ast,
         args.show_symbols,
         args.show_quads,
-        args.no_optimize
+        args.no_optimize,
+        fixed,
+        outputs,
+        cache,
+        summary,
+        profiler,
+        args.reuse_registers,
+        args.chunk_size,
+        args.lookup_support
     )
+    
+    if profiler is not None and not summary:
+        print_profile(profiler)
+    return status
 
 
 if __name__ == "__main__":
@@ -17,12 +17,7 @@ import tempfile
 import os
 
 # Import compiler modules
-from lexer import Lexer
-from parser import Parser
-from semantic import SemanticAnalyzer
-from icg import IntermediateCodeGenerator
-from optimizer import Optimizer
-from codegen import CodeGenerator
+from compiler import compile_source
 
 
 class CompilerGUI:
@@ -631,16 +626,19 @@ class CompilerGUI:
         
         self.output_text_area.delete('1.0', tk.END)
         self.update_status("Compiling...")
+        self.root.update()
         
         try:
+            result = compile_source(source_code)
+            
             # Phase 1: Lexical Analysis
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
             self.output_text_area.insert(tk.END, "Phase 1: Lexical Analysis\n")
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
-            self.root.update()
             
-            lexer = Lexer()
-            self.tokens = lexer.tokenize(source_code)
+            if result.failed_phase == 'lexical':
+                raise SyntaxError(result.errors[0])
+            self.tokens = result.tokens
             self.output_text_area.insert(tk.END, f"[OK] Phase 1 Complete ({len(self.tokens)} tokens)\n\n")
             
             # Show token details
@@ -655,10 +653,10 @@ class CompilerGUI:
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
             self.output_text_area.insert(tk.END, "Phase 2: Syntax Analysis (LL(1) Parser)\n")
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
-            self.root.update()
             
-            parser = Parser(self.tokens)
-            self.ast = parser.parse_program()
+            if result.failed_phase == 'syntax':
+                raise SyntaxError(result.errors[0])
+            self.ast = result.ast
             self.output_text_area.insert(tk.END, f"[OK] Phase 2 Complete\n")
             self.output_text_area.insert(tk.END, f"  Circuit Name: {self.ast.name}\n")
             self.output_text_area.insert(tk.END, f"  Declarations: {len(self.ast.declarations)}\n")
@@ -686,19 +684,15 @@ class CompilerGUI:
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
             self.output_text_area.insert(tk.END, "Phase 3: Semantic Analysis\n")
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
-            self.root.update()
-            
-            analyzer = SemanticAnalyzer(self.ast)
-            semantic_result = analyzer.analyze()
             
-            if not semantic_result['success']:
+            if result.failed_phase == 'semantic':
                 self.output_text_area.insert(tk.END, "[ERROR] Semantic Errors Found:\n")
-                for error in semantic_result['errors']:
+                for error in result.errors:
                     self.output_text_area.insert(tk.END, f"  {error}\n")
                 self.update_status("Compilation failed: Semantic errors")
                 return
             
-            self.symbol_table = semantic_result['symbol_table']
+            self.symbol_table = result.symbol_table
             self.output_text_area.insert(tk.END, f"[OK] Phase 3 Complete\n")
             self.output_text_area.insert(tk.END, f"  Symbol table entries: {len(self.symbol_table)}\n\n")
             
@@ -718,10 +712,13 @@ class CompilerGUI:
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
             self.output_text_area.insert(tk.END, "Phase 4: Intermediate Code Generation\n")
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
-            self.root.update()
             
-            icg = IntermediateCodeGenerator(self.ast)
-            self.quads = icg.generate()
+            if result.failed_phase == 'icg':
+                self.output_text_area.insert(tk.END, f"[ERROR] {result.errors[0]}\n")
+                self.update_status("Compilation failed: Intermediate code generation error")
+                return
+            
+            self.quads = result.quads
             self.output_text_area.insert(tk.END, f"[OK] Phase 4 Complete ({len(self.quads)} quadruples)\n\n")
             
             # Show quadruples
@@ -739,10 +736,8 @@ class CompilerGUI:
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
             self.output_text_area.insert(tk.END, "Phase 5: Optimization\n")
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
-            self.root.update()
             
-            optimizer = Optimizer(self.quads, self.symbol_table)
-            self.optimized_quads = optimizer.optimize()
+            self.optimized_quads = result.optimized_quads
             removed = len(self.quads) - len(self.optimized_quads)
             self.output_text_area.insert(tk.END, f"[OK] Phase 5 Complete ({removed} instructions removed)\n\n")
             
@@ -770,10 +765,8 @@ class CompilerGUI:
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
             self.output_text_area.insert(tk.END, "Phase 6: Code Generation\n")
             self.output_text_area.insert(tk.END, "=" * 60 + "\n")
-            self.root.update()
             
-            codegen = CodeGenerator(self.optimized_quads, self.symbol_table, self.ast.name)
-            python_code = codegen.generate()
+            python_code = result.code
             
             self.output_text_area.insert(tk.END, f"[OK] Phase 6 Complete\n\n")
             self.phase_buttons['CodeGen'].config(bg='#107c10')
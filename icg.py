@@ -1,20 +1,25 @@
 """
 Phase 4: Intermediate Code Generation
-Generates quadruples (three-address code) from AST.
+Generates quadruples (three-address code) from AST and schedules them
+in topological (level) order.
 """
 
-from typing import List, Optional
-from parser import Program, Gate
+from array import array
+from typing import Dict, List, Optional
+from parser import Program, Gate, TIE_VALUES
 
 
 class Quadruple:
     """Represents a quadruple (three-address code instruction)."""
     
+    __slots__ = ('op', 'arg1', 'arg2', 'result', 'level')
+    
     def __init__(self, op: str, arg1: Optional[str], arg2: Optional[str], result: str):
         self.op = op  # Operation (AND, OR, XOR, NOT, etc.)
         self.arg1 = arg1  # First operand
         self.arg2 = arg2  # Second operand (None for unary operations)
         self.result = result  # Result variable
+        self.level = 0  # Logic level, assigned by the Scheduler
     
     def __repr__(self):
         if self.arg2 is None:
@@ -22,6 +27,148 @@ class Quadruple:
         return f"({self.op}, {self.arg1}, {self.arg2}, {self.result})"
 
 
+class QuadTable:
+    """
+    Compact struct-of-arrays form of a quadruple list.
+    
+    Opcodes are stored in an array('B') and operands, results and levels in
+    array('i') columns, with every identifier (and constant) replaced by its
+    index in names; -1 marks a missing arg2. Storage is a few machine words
+    per quadruple instead of one Python object each, which keeps large
+    netlists small in memory and in the compile cache.
+    """
+    
+    OPCODES = ('ASSIGN', 'NOT', 'AND', 'OR', 'XOR', 'NAND', 'NOR')
+    OPCODE_INDEX = {op: index for index, op in enumerate(OPCODES)}
+    
+    __slots__ = ('names', 'ops', 'arg1', 'arg2', 'results', 'levels')
+    
+    def __init__(self):
+        self.names: List[str] = []  # Identifier id -> name
+        self.ops = array('B')
+        self.arg1 = array('i')
+        self.arg2 = array('i')
+        self.results = array('i')
+        self.levels = array('i')
+    
+    def __len__(self):
+        return len(self.ops)
+    
+    def __getitem__(self, index: int) -> Quadruple:
+        names = self.names
+        arg2 = self.arg2[index]
+        quad = Quadruple(
+            self.OPCODES[self.ops[index]],
+            names[self.arg1[index]],
+            names[arg2] if arg2 >= 0 else None,
+            names[self.results[index]],
+        )
+        quad.level = self.levels[index]
+        return quad
+    
+    @classmethod
+    def from_quads(cls, quads: List[Quadruple]) -> 'QuadTable':
+        """Pack a list of quadruples."""
+        table = cls()
+        ids: Dict[str, int] = {}
+        
+        def intern(name: str) -> int:
+            index = ids.get(name)
+            if index is None:
+                index = ids[name] = len(table.names)
+                table.names.append(name)
+            return index
+        
+        for quad in quads:
+            table.ops.append(cls.OPCODE_INDEX[quad.op])
+            table.arg1.append(intern(quad.arg1))
+            table.arg2.append(intern(quad.arg2) if quad.arg2 is not None else -1)
+            table.results.append(intern(quad.result))
+            table.levels.append(quad.level)
+        return table
+    
+    def to_quads(self) -> List[Quadruple]:
+        """Unpack into a list of Quadruple objects."""
+        return [self[index] for index in range(len(self))]
+
+
+class Scheduler:
+    """
+    Topologically schedules quadruples by logic level.
+    
+    A quadruple's level is 0 when it reads only inputs and constants, and
+    otherwise one more than the highest level among the quadruples that
+    produce its operands. Emitting quadruples level by level guarantees
+    every operand is computed before it is read, regardless of source order.
+    """
+    
+    def __init__(self, quads: List[Quadruple]):
+        self.quads = quads
+        self.levels: List[List[Quadruple]] = []
+    
+    def build_dependencies(self) -> List[List[int]]:
+        """Return, for each quadruple index, the indices of quadruples that read it."""
+        producer: Dict[str, int] = {}
+        users: List[List[int]] = [[] for _ in self.quads]
+        
+        for index, quad in enumerate(self.quads):
+            # Repeated assignments to one name keep their source order,
+            # and readers see the last one (as in the symbol table)
+            if quad.result in producer:
+                users[producer[quad.result]].append(index)
+            producer[quad.result] = index
+        
+        for index, quad in enumerate(self.quads):
+            for operand in (quad.arg1, quad.arg2):
+                if operand in producer:
+                    users[producer[operand]].append(index)
+        
+        return users
+    
+    def schedule(self) -> List[Quadruple]:
+        """
+        Compute levels with Kahn's algorithm in O(V + E) and return the
+        quadruples ordered by level, keeping source order within a level.
+        Sets quad.level on every quadruple and fills self.levels.
+        
+        Raises:
+            ValueError: If the quadruples contain a combinational cycle
+        """
+        users = self.build_dependencies()
+        pending = [0] * len(self.quads)
+        for readers in users:
+            for reader in readers:
+                pending[reader] += 1
+        
+        level = [0] * len(self.quads)
+        ready = [index for index, count in enumerate(pending) if count == 0]
+        processed = 0
+        
+        while ready:
+            index = ready.pop()
+            processed += 1
+            for reader in users[index]:
+                level[reader] = max(level[reader], level[index] + 1)
+                pending[reader] -= 1
+                if pending[reader] == 0:
+                    ready.append(reader)
+        
+        if processed != len(self.quads):
+            stuck = [quad.result for index, quad in enumerate(self.quads) if pending[index]]
+            raise ValueError(
+                f"Cannot schedule quadruples: combinational cycle through "
+                f"{', '.join(stuck[:5])}"
+            )
+        
+        depth = max(level) + 1 if level else 0
+        self.levels = [[] for _ in range(depth)]
+        for index, quad in enumerate(self.quads):
+            quad.level = level[index]
+            self.levels[quad.level].append(quad)
+        
+        return [quad for bucket in self.levels for quad in bucket]
+
+
 class IntermediateCodeGenerator:
     """Generates intermediate code (quadruples) from AST."""
     
@@ -30,7 +177,15 @@ class IntermediateCodeGenerator:
         self.quads: List[Quadruple] = []
     
     def generate(self) -> List[Quadruple]:
-        """Generate quadruples from AST."""
+        """Generate quadruples from AST, scheduled in topological order."""
+        # Tie-offs drive their pins with a constant
+        for decl in self.ast.declarations:
+            if decl.category in TIE_VALUES:
+                for identifier in decl.identifiers:
+                    self.quads.append(
+                        Quadruple('ASSIGN', TIE_VALUES[decl.category], None, identifier)
+                    )
+        
         for gate in self.ast.gates:
             if gate.gate_type == 'NOT':
                 # Unary operation
@@ -51,6 +206,9 @@ class IntermediateCodeGenerator:
             
             self.quads.append(quad)
         
+        # Gates may be written in any order; evaluate operands first
+        self.quads = Scheduler(self.quads).schedule()
+        
         return self.quads
     
     def print_quads(self):
@@ -58,7 +216,7 @@ class IntermediateCodeGenerator:
         print("Intermediate Code (Quadruples):")
         print("-" * 50)
         for i, quad in enumerate(self.quads, 1):
-            print(f"{i}: {quad}")
+            print(f"{i}: {quad}  [level {quad.level}]")
 
 
 if __name__ == "__main__":
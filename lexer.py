@@ -4,12 +4,46 @@ Tokenizes source code into a stream of tokens.
 """
 
 import re
+import sys
 from typing import List, Optional
 
 
+KEYWORDS = frozenset({
+    'CIRCUIT', 'INPUT', 'OUTPUT', 'WIRE', 'TIE0', 'TIE1',
+    'AND', 'OR', 'XOR', 'NAND', 'NOR', 'NOT',
+})
+
+# Token patterns combined into one alternation. Keywords are matched as
+# IDENTIFIERs and reclassified by a set lookup, which gives the same result
+# as trying a \b-anchored KEYWORD pattern first. NEWLINE swallows the
+# indentation and blank lines that follow it, and MISMATCH catches any
+# character no other pattern accepts.
+TOKEN_PATTERNS = [
+    ('IDENTIFIER', r'[a-zA-Z_][a-zA-Z0-9_]*'),
+    ('CONSTANT', r'[0-9]+'),
+    ('LBRACE', r'\{'),
+    ('RBRACE', r'\}'),
+    ('LPAREN', r'\('),
+    ('RPAREN', r'\)'),
+    ('SEMICOLON', r';'),
+    ('COMMA', r','),
+    ('EQUALS', r'='),
+    ('WHITESPACE', r'[ \t]+'),
+    ('NEWLINE', r'\n[ \t\n]*'),
+    ('MISMATCH', r'.'),
+]
+
+# Compiled once at import time and shared by every Lexer instance
+MASTER_PATTERN = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOKEN_PATTERNS)
+)
+
+
 class Token:
     """Represents a token with type, value, and position information."""
     
+    __slots__ = ('type', 'value', 'line', 'column')
+    
     def __init__(self, type: str, value: str, line: int, column: int):
         self.type = type
         self.value = value
@@ -23,32 +57,14 @@ class Token:
 class Lexer:
     """Lexical analyzer for Logic Gate Architect DSL."""
     
-    def __init__(self):
-        # Token patterns in order of precedence (KEYWORD before IDENTIFIER)
-        self.token_patterns = [
-            ('KEYWORD', r'\b(CIRCUIT|INPUT|OUTPUT|WIRE|AND|OR|XOR|NAND|NOR|NOT)\b'),
-            ('IDENTIFIER', r'[a-zA-Z_][a-zA-Z0-9_]*'),
-            ('LBRACE', r'\{'),
-            ('RBRACE', r'\}'),
-            ('LPAREN', r'\('),
-            ('RPAREN', r'\)'),
-            ('SEMICOLON', r';'),
-            ('COMMA', r','),
-            ('EQUALS', r'='),
-            ('WHITESPACE', r'[ \t]+'),
-            ('NEWLINE', r'\n'),
-        ]
-        
-        # Compile regex patterns
-        self.compiled_patterns = [
-            (name, re.compile(pattern)) 
-            for name, pattern in self.token_patterns
-        ]
-    
     def tokenize(self, source_code: str) -> List[Token]:
         """
         Tokenize source code into a list of tokens.
         
+        The source is scanned once with MASTER_PATTERN. Columns are derived
+        from the offset of the most recent newline, so positions cost nothing
+        extra per character. Identifiers are interned.
+        
         Args:
             source_code: Input source code string
             
@@ -59,42 +75,40 @@ class Lexer:
             SyntaxError: If an invalid character is encountered
         """
         tokens = []
-        position = 0
+        append = tokens.append
         line = 1
-        column = 1
+        line_start = 0  # Offset of the first character of the current line
         
-        while position < len(source_code):
-            matched = False
+        for match in MASTER_PATTERN.finditer(source_code):
+            token_type = match.lastgroup
+            
+            if token_type == 'WHITESPACE':
+                continue
             
-            for token_type, pattern in self.compiled_patterns:
-                match = pattern.match(source_code, position)
-                
-                if match:
-                    value = match.group(0)
-                    
-                    # Don't create tokens for whitespace/newlines
-                    if token_type not in ('WHITESPACE', 'NEWLINE'):
-                        token = Token(token_type, value, line, column)
-                        tokens.append(token)
-                    
-                    # Update position
-                    position = match.end()
-                    
-                    # Update line/column tracking
-                    if token_type == 'NEWLINE':
-                        line += 1
-                        column = 1
-                    else:
-                        column += len(value)
-                    
-                    matched = True
-                    break
+            if token_type == 'NEWLINE':
+                value = match.group()
+                line += value.count('\n')
+                line_start = match.start() + value.rfind('\n') + 1
+                continue
             
-            if not matched:
+            value = match.group()
+            column = match.start() - line_start + 1
+            
+            if token_type == 'MISMATCH':
                 raise SyntaxError(
                     f"Lexical Error at line {line}, column {column}: "
-                    f"Unexpected character '{source_code[position]}'"
+                    f"Unexpected character '{value}'"
                 )
+            
+            if token_type == 'IDENTIFIER':
+                if value in KEYWORDS:
+                    token_type = 'KEYWORD'
+                else:
+                    # One shared string per name for the AST, symbol
+                    # table and quadruples built from it
+                    value = sys.intern(value)
+            
+            append(Token(token_type, value, line, column))
         
         return tokens
 
@@ -1,47 +1,167 @@
 """
 Phase 5: Code Optimizer
-Optimizes intermediate code using constant folding, identity laws, and dead code elimination.
+Optimizes intermediate code to a fixed point using constant folding, identity
+laws, copy propagation, common subexpression elimination, and dead code
+elimination.
 """
 
-from typing import List, Dict
-from icg import Quadruple
-from semantic import SymbolInfo
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import List, Dict, Optional, Set, Tuple
+from icg import Quadruple, Scheduler
+from parser import CONSTANTS
+from semantic import SymbolInfo, SymbolTable
+
+
+# Gates whose operands can be swapped without changing the result
+COMMUTATIVE_OPS = frozenset({'AND', 'OR', 'XOR', 'NAND', 'NOR'})
+
+COMPLEMENT = {'0': '1', '1': '0'}
+
+# What a binary gate reduces to when one operand is the given constant:
+# a constant, the other operand ('x'), or its complement ('~x')
+CONSTANT_RULES = {
+    ('AND', '0'): '0', ('AND', '1'): 'x',
+    ('OR', '0'): 'x', ('OR', '1'): '1',
+    ('XOR', '0'): 'x', ('XOR', '1'): '~x',
+    ('NAND', '0'): '1', ('NAND', '1'): '~x',
+    ('NOR', '0'): '~x', ('NOR', '1'): '0',
+}
 
 
 class Optimizer:
     """Optimizes quadruples using various techniques."""
     
-    def __init__(self, quads: List[Quadruple], symbol_table: Dict[str, SymbolInfo]):
+    def __init__(self, quads: List[Quadruple], symbol_table: SymbolTable,
+                 profiler=None):
         self.quads = quads
         self.symbol_table = symbol_table
+        self.profiler = profiler  # Optional PhaseProfiler timing each sub-pass
+        self.outputs: Set[str] = set(symbol_table.names_in('OUTPUT'))  # Read by is_output()
+    
+    def sub_pass(self, name: str):
+        """Context manager that profiles a sub-pass when a profiler is set."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.phase(name)
+    
+    def specialize(self, fixed: Dict[str, str]):
+        """
+        Partially evaluate the circuit for fixed INPUT values.
+        
+        Each fixed INPUT is re-declared as a TIE0/TIE1 pin driven by its
+        value, so it leaves the simulate() signature and constant
+        propagation folds it through the circuit when optimize() runs.
+        Updates self.quads and self.symbol_table (the caller's symbol table
+        is not modified).
+        
+        Args:
+            fixed: Mapping of INPUT name to '0' or '1'
+            
+        Raises:
+            ValueError: If a name is not an INPUT or a value is not 0 or 1
+        """
+        with self.sub_pass('specialize'):
+            symbol_table = self.symbol_table.copy()
+            ties = []
+            
+            for name, value in fixed.items():
+                info = symbol_table.get(name)
+                if info is None or info.category != 'INPUT':
+                    raise ValueError(f"Cannot fix '{name}': not an INPUT of this circuit")
+                if value not in CONSTANTS:
+                    raise ValueError(f"Cannot fix '{name}' to '{value}': expected 0 or 1")
+                
+                tied = SymbolInfo(category=f"TIE{value}", defined=True)
+                tied.used_by = info.used_by
+                symbol_table[name] = tied
+                ties.append(Quadruple('ASSIGN', value, None, name))
+            
+            self.symbol_table = symbol_table
+            self.quads = Scheduler(ties + list(self.quads)).schedule()
+    
+    def extract_cone(self, outputs: List[str]):
+        """
+        Restrict the circuit to the cone of influence of selected OUTPUTs.
+        
+        Walks the SymbolInfo.source graph backwards from the selected
+        OUTPUTs and keeps only quadruples that compute a symbol in their
+        transitive fan-in. Symbols outside the cone, including unused
+        INPUTs, are dropped from self.symbol_table; unselected OUTPUTs
+        inside the cone become WIREs. The caller's symbol table is not
+        modified.
+        
+        Args:
+            outputs: Names of the OUTPUTs to keep
+            
+        Raises:
+            ValueError: If a name is not an OUTPUT of this circuit
+        """
+        with self.sub_pass('extract_cone'):
+            for name in outputs:
+                info = self.symbol_table.get(name)
+                if info is None or info.category != 'OUTPUT':
+                    raise ValueError(f"Cannot select '{name}': not an OUTPUT of this circuit")
+            
+            cone: Set[str] = set()
+            stack = list(outputs)
+            while stack:
+                name = stack.pop()
+                if name in cone:
+                    continue
+                cone.add(name)
+                info = self.symbol_table.get(name)
+                if info and info.source:
+                    stack.extend(info.source.inputs)
+            
+            selected = set(outputs)
+            symbol_table = self.symbol_table.empty_like()
+            for name, info in self.symbol_table.items():
+                if name not in cone:
+                    continue
+                if info.category == 'OUTPUT' and name not in selected:
+                    wire = SymbolInfo(category='WIRE', defined=info.defined, source=info.source)
+                    wire.used_by = info.used_by
+                    info = wire
+                symbol_table[name] = info
+            
+            self.symbol_table = symbol_table
+            self.outputs = selected
+            self.quads = [quad for quad in self.quads if quad.result in cone]
     
     def constant_folding(self, quad: Quadruple) -> Quadruple:
-        """Apply constant folding rules."""
-        if quad.op == 'AND':
-            if quad.arg1 == '0' or quad.arg2 == '0':
-                return Quadruple('ASSIGN', '0', None, quad.result)
-            if quad.arg1 == '1':
-                return Quadruple('ASSIGN', quad.arg2, None, quad.result)
-            if quad.arg2 == '1':
-                return Quadruple('ASSIGN', quad.arg1, None, quad.result)
-        
-        elif quad.op == 'OR':
-            if quad.arg1 == '1' or quad.arg2 == '1':
-                return Quadruple('ASSIGN', '1', None, quad.result)
-            if quad.arg1 == '0':
-                return Quadruple('ASSIGN', quad.arg2, None, quad.result)
-            if quad.arg2 == '0':
-                return Quadruple('ASSIGN', quad.arg1, None, quad.result)
-        
-        elif quad.op == 'XOR':
-            if quad.arg1 == '0':
-                return Quadruple('ASSIGN', quad.arg2, None, quad.result)
-            if quad.arg2 == '0':
-                return Quadruple('ASSIGN', quad.arg1, None, quad.result)
-            if quad.arg1 == quad.arg2:
-                return Quadruple('ASSIGN', '0', None, quad.result)
+        """
+        Apply constant folding rules to every gate type.
         
-        return quad
+        A gate with one constant operand reduces to a constant, the other
+        operand, or its complement (CONSTANT_RULES). With two constants the
+        same rule yields the evaluated value.
+        """
+        if quad.op == 'ASSIGN':
+            return quad
+        
+        if quad.op == 'NOT':
+            if quad.arg1 in CONSTANTS:
+                return Quadruple('ASSIGN', COMPLEMENT[quad.arg1], None, quad.result)
+            return quad
+        
+        if quad.arg1 in CONSTANTS:
+            constant, other = quad.arg1, quad.arg2
+        elif quad.arg2 in CONSTANTS:
+            constant, other = quad.arg2, quad.arg1
+        else:
+            return quad
+        
+        rule = CONSTANT_RULES.get((quad.op, constant))
+        if rule is None:
+            return quad
+        if rule == 'x':
+            return Quadruple('ASSIGN', other, None, quad.result)
+        if rule == '~x':
+            if other in CONSTANTS:
+                return Quadruple('ASSIGN', COMPLEMENT[other], None, quad.result)
+            return Quadruple('NOT', other, None, quad.result)
+        return Quadruple('ASSIGN', rule, None, quad.result)
     
     def algebraic_simplification(self, quad: Quadruple) -> Quadruple:
         """Apply algebraic identities."""
@@ -57,45 +177,190 @@ class Optimizer:
         if quad.op == 'XOR' and quad.arg1 == quad.arg2:
             return Quadruple('ASSIGN', '0', None, quad.result)
         
+        # A NAND A = A NOR A = NOT A
+        if quad.op in ('NAND', 'NOR') and quad.arg1 == quad.arg2:
+            return Quadruple('NOT', quad.arg1, None, quad.result)
+        
         return quad
     
-    def eliminate_dead_code(self, quads: List[Quadruple]) -> List[Quadruple]:
-        """Remove unused computations."""
-        used = set()
+    def operands(self, quad: Quadruple) -> List[str]:
+        """Return the operands a quadruple reads."""
+        if quad.arg2 is None:
+            return [quad.arg1]
+        return [quad.arg1, quad.arg2]
+    
+    def gate_key(self, quad: Quadruple) -> Tuple[str, str, Optional[str]]:
+        """Structural hash key: (op, operands), commutative operands sorted."""
+        if quad.op in COMMUTATIVE_OPS and quad.arg2 < quad.arg1:
+            return (quad.op, quad.arg2, quad.arg1)
+        return (quad.op, quad.arg1, quad.arg2)
+    
+    def is_output(self, identifier: str) -> bool:
+        """Check whether an identifier is a circuit OUTPUT."""
+        return identifier in self.outputs
+    
+    def coalesce_output_copies(self, quads: List[Quadruple]) -> List[Quadruple]:
+        """
+        Remove ASSIGN copies into OUTPUTs by renaming their source.
         
-        # Mark all used variables
+        After copy propagation every reader already uses the copy's source,
+        so the only ASSIGNs left are OUTPUT = wire. When the wire is computed
+        by a gate and is not itself an OUTPUT, that gate writes the OUTPUT
+        directly and the wire is renamed everywhere. A copy is kept only when
+        the alias has to be materialized: its source is an INPUT, a constant,
+        another OUTPUT, or a wire already claimed by a different OUTPUT.
+        """
+        defined: Dict[str, int] = defaultdict(int)
         for quad in quads:
-            if quad.arg1:
-                used.add(quad.arg1)
-            if quad.arg2:
-                used.add(quad.arg2)
+            defined[quad.result] += 1
         
-        # Keep outputs and used results
-        optimized = []
+        rename: Dict[str, str] = {}
         for quad in quads:
-            result_info = self.symbol_table.get(quad.result)
-            is_output = result_info and result_info.category == 'OUTPUT'
-            is_used = quad.result in used
-            
-            if is_output or is_used:
-                optimized.append(quad)
+            if quad.op != 'ASSIGN' or not self.is_output(quad.result):
+                continue
+            source = quad.arg1
+            if (defined[source] == 1 and defined[quad.result] == 1
+                    and not self.is_output(source) and source not in rename):
+                rename[source] = quad.result
+        
+        if not rename:
+            return quads
+        
+        coalesced = []
+        for quad in quads:
+            if quad.op == 'ASSIGN' and rename.get(quad.arg1) == quad.result:
+                continue
+            arg1 = rename.get(quad.arg1, quad.arg1)
+            arg2 = rename.get(quad.arg2, quad.arg2)
+            result = rename.get(quad.result, quad.result)
+            if (arg1, arg2, result) != (quad.arg1, quad.arg2, quad.result):
+                quad = Quadruple(quad.op, arg1, arg2, result)
+            coalesced.append(quad)
         
-        return optimized
+        return coalesced
     
     def optimize(self) -> List[Quadruple]:
-        """Run all optimizations."""
-        optimized = []
+        """
+        Run all optimizations to a fixed point using a worklist.
+        
+        Each quadruple is visited in scheduled order and then revisited only
+        when something it depends on changes: when the definition of one of
+        its operands is rewritten, it is re-run through copy propagation,
+        constant folding, algebraic simplification and structural hashing;
+        when the use count of its result drops to zero and it is not an
+        OUTPUT, it is removed, which in turn releases its operands. Work is
+        proportional to the number of rewrites rather than to repeated
+        passes over the whole circuit. Copies left feeding OUTPUTs are then
+        coalesced away.
+        
+        Expects scheduled quadruples and returns them re-scheduled.
+        """
+        with self.sub_pass('worklist'):
+            optimized = self.run_worklist()
+        
+        with self.sub_pass('coalesce'):
+            optimized = self.coalesce_output_copies(optimized)
+        
+        # Re-level: simplification can shorten paths through the circuit
+        with self.sub_pass('schedule'):
+            return Scheduler(optimized).schedule()
+    
+    def run_worklist(self) -> List[Quadruple]:
+        """Run the worklist rewrite loop and return the live quadruples."""
+        quads = list(self.quads)
+        
+        # Where each result is defined; names written more than once are
+        # order-sensitive and are never propagated through or removed
+        position: Dict[str, int] = {}
+        redefined: Set[str] = set()
+        for index, quad in enumerate(quads):
+            if quad.result in position:
+                redefined.add(quad.result)
+            position[quad.result] = index
         
-        # Pass 1: Constant folding and algebraic simplification
-        for quad in self.quads:
-            quad = self.constant_folding(quad)
-            quad = self.algebraic_simplification(quad)
-            optimized.append(quad)
+        # Use counts drive dead code elimination; readers drive revisits
+        readers: Dict[str, List[int]] = defaultdict(list)
+        use_count: Dict[str, int] = defaultdict(int)
+        for index, quad in enumerate(quads):
+            for operand in self.operands(quad):
+                readers[operand].append(index)
+                use_count[operand] += 1
         
-        # Pass 2: Dead code elimination
-        optimized = self.eliminate_dead_code(optimized)
+        live = [True] * len(quads)
+        queued = [True] * len(quads)
+        worklist = list(reversed(range(len(quads))))  # pop() yields scheduled order
+        first_result: Dict[Tuple[str, str, Optional[str]], str] = {}
+        
+        def enqueue(index: int):
+            if live[index] and not queued[index]:
+                queued[index] = True
+                worklist.append(index)
+        
+        def release(operand: str):
+            use_count[operand] -= 1
+            if use_count[operand] == 0 and operand in position:
+                enqueue(position[operand])
+        
+        def resolve(operand: Optional[str]) -> Optional[str]:
+            # Copy propagation: read through live ASSIGN chains
+            while operand in position and operand not in redefined:
+                source = quads[position[operand]]
+                if not live[position[operand]] or source.op != 'ASSIGN' or source.arg1 in redefined:
+                    break
+                operand = source.arg1
+            return operand
+        
+        while worklist:
+            index = worklist.pop()
+            queued[index] = False
+            if not live[index]:
+                continue
+            
+            quad = quads[index]
+            
+            # Dead code elimination
+            if (use_count[quad.result] == 0 and not self.is_output(quad.result)
+                    and quad.result not in redefined):
+                live[index] = False
+                for operand in self.operands(quad):
+                    release(operand)
+                continue
+            
+            # Copy propagation, constant folding, algebraic simplification
+            new = Quadruple(quad.op, resolve(quad.arg1), resolve(quad.arg2), quad.result)
+            new = self.constant_folding(new)
+            new = self.algebraic_simplification(new)
+            
+            # Structural hashing: reuse the earliest identical gate
+            if new.op != 'ASSIGN' and quad.result not in redefined:
+                key = self.gate_key(new)
+                other = first_result.get(key)
+                other_index = position.get(other)
+                if (other is not None and other != quad.result and live[other_index]
+                        and self.gate_key(quads[other_index]) == key):
+                    if other_index < index:
+                        new = Quadruple('ASSIGN', other, None, quad.result)
+                    else:
+                        first_result[key] = quad.result
+                        enqueue(other_index)
+                else:
+                    first_result[key] = quad.result
+            
+            if (new.op, new.arg1, new.arg2) == (quad.op, quad.arg1, quad.arg2):
+                continue
+            
+            quads[index] = new
+            for operand in self.operands(new):
+                readers[operand].append(index)
+                use_count[operand] += 1
+            for operand in self.operands(quad):
+                release(operand)
+            
+            # Readers may now fold, propagate the copy, or match another gate
+            for reader in readers[quad.result]:
+                enqueue(reader)
         
-        return optimized
+        return [quad for index, quad in enumerate(quads) if live[index]]
 
 
 if __name__ == "__main__":
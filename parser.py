@@ -7,14 +7,24 @@ from typing import List, Optional, Dict, Any
 from lexer import Token
 
 
+# Logic constants accepted as gate inputs
+CONSTANTS = frozenset({'0', '1'})
+
+# Tie-off declaration keywords and the constant each one drives
+TIE_VALUES = {'TIE0': '0', 'TIE1': '1'}
+
+
 class ASTNode:
     """Base class for AST nodes."""
-    pass
+    
+    __slots__ = ()
 
 
 class Program(ASTNode):
     """Represents a complete program."""
     
+    __slots__ = ('name', 'declarations', 'gates')
+    
     def __init__(self, name: str, declarations: List, gates: List):
         self.name = name
         self.declarations = declarations
@@ -25,7 +35,9 @@ class Program(ASTNode):
 
 
 class Declaration(ASTNode):
-    """Represents a declaration (INPUT, OUTPUT, or WIRE)."""
+    """Represents a declaration (INPUT, OUTPUT, WIRE, or a TIE0/TIE1 tie-off)."""
+    
+    __slots__ = ('category', 'identifiers')
     
     def __init__(self, category: str, identifiers: List[str]):
         self.category = category
@@ -38,6 +50,8 @@ class Declaration(ASTNode):
 class Gate(ASTNode):
     """Represents a gate assignment."""
     
+    __slots__ = ('output', 'gate_type', 'inputs')
+    
     def __init__(self, output: str, gate_type: str, inputs: List[str]):
         self.output = output
         self.gate_type = gate_type
@@ -103,7 +117,7 @@ class Parser:
         
         while (self.peek() and 
                self.peek().type == 'KEYWORD' and 
-               self.peek().value in ['INPUT', 'OUTPUT', 'WIRE']):
+               self.peek().value in ['INPUT', 'OUTPUT', 'WIRE', *TIE_VALUES]):
             keyword = self.advance()
             identifiers = self.parse_identifier_list()
             self.expect('SEMICOLON')
@@ -140,6 +154,28 @@ class Parser:
                 )
         return token
     
+    def parse_gate_inputs(self) -> List[str]:
+        """Parse a comma-separated list of gate inputs (identifiers or 0/1 constants)."""
+        inputs = [self.expect_gate_input()]
+        
+        while self.match('COMMA'):
+            inputs.append(self.expect_gate_input())
+        
+        return inputs
+    
+    def expect_gate_input(self) -> str:
+        """Expect an identifier or a logic constant (0 or 1)."""
+        token = self.match('CONSTANT')
+        if not token:
+            return self.expect_identifier().value
+        
+        if token.value not in CONSTANTS:
+            raise SyntaxError(
+                f"Parse Error at line {token.line}, column {token.column}: "
+                f"Constant '{token.value}' is not a logic value (expected 0 or 1)"
+            )
+        return token.value
+    
     def parse_gates(self) -> List[Gate]:
         """Parse zero or more gate assignments."""
         gates = []
@@ -149,7 +185,7 @@ class Parser:
             self.expect('EQUALS')
             gate_type_token = self.expect('KEYWORD')
             self.expect('LPAREN')
-            inputs = self.parse_identifier_list()
+            inputs = self.parse_gate_inputs()
             self.expect('RPAREN')
             self.expect('SEMICOLON')
             
@@ -0,0 +1,121 @@
+"""
+Phase Profiler
+Records wall time, CPU time and peak memory for compiler phases and the
+optimizer sub-passes nested inside them.
+"""
+
+import cProfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class PhaseRecord:
+    """Measurements for one run of a phase or sub-pass."""
+    name: str  # Dotted path, e.g. 'optimization.worklist'
+    depth: int  # 0 for a compiler phase, 1 for a sub-pass, ...
+    wall: float = 0.0  # Seconds
+    cpu: float = 0.0  # Seconds of process CPU time
+    peak_bytes: int = 0  # Peak traced memory above the level at entry
+
+
+class PhaseProfiler:
+    """
+    Collects a PhaseRecord for every phase() block, in the order entered.
+    
+    Peak memory is measured with tracemalloc, which is started on the first
+    phase and stopped by close() if this profiler started it. Nested blocks
+    reset the tracemalloc peak, so each block folds its children's peaks
+    back into its own. When profile_dir is given, every top-level phase is
+    also run under cProfile and dumped to <profile_dir>/<phase>.prof for
+    pstats or snakeviz.
+    """
+    
+    def __init__(self, profile_dir: Optional[str] = None):
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.records: List[PhaseRecord] = []
+        self.stack: List[List[Any]] = []  # [record, start memory, peak so far]
+        self.started_tracing = False
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Measure the enclosed block as phase name (nested under the open phase)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        
+        if self.stack:
+            # Fold the parent's peak so far in before the child resets it
+            parent = self.stack[-1]
+            parent[2] = max(parent[2], tracemalloc.get_traced_memory()[1])
+            name = f"{parent[0].name}.{name}"
+        
+        record = PhaseRecord(name, len(self.stack))
+        self.records.append(record)
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        self.stack.append([record, current, current])
+        
+        profile = None
+        if self.profile_dir is not None and record.depth == 0:
+            profile = cProfile.Profile()
+        
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile is not None:
+                profile.disable()
+            record.wall += time.perf_counter() - wall
+            record.cpu += time.process_time() - cpu
+            
+            _, start, peak = self.stack.pop()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            record.peak_bytes = peak - start
+            if self.stack:
+                parent = self.stack[-1]
+                parent[2] = max(parent[2], peak)
+                tracemalloc.reset_peak()
+            
+            if profile is not None:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(str(self.profile_dir / f"{record.name}.prof"))
+    
+    def close(self):
+        """Stop tracemalloc if this profiler started it."""
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+    
+    def to_dict(self) -> List[Dict[str, Any]]:
+        """Return the records as JSON-serializable dicts, times in milliseconds."""
+        return [
+            {
+                'phase': record.name,
+                'wall_ms': round(record.wall * 1000, 3),
+                'cpu_ms': round(record.cpu * 1000, 3),
+                'peak_kb': round(record.peak_bytes / 1024, 1),
+            }
+            for record in self.records
+        ]
+    
+    def format_table(self) -> str:
+        """Return the records as a text table, sub-passes indented under their phase."""
+        lines = [
+            f"{'Phase':<32}  {'Wall (ms)':>10}  {'CPU (ms)':>10}  {'Peak (KB)':>10}",
+            "-" * 68,
+        ]
+        for record in self.records:
+            label = "  " * record.depth + record.name.rsplit('.', 1)[-1]
+            lines.append(
+                f"{label:<32}  {record.wall * 1000:>10.3f}  {record.cpu * 1000:>10.3f}  "
+                f"{record.peak_bytes / 1024:>10.1f}"
+            )
+        return "\n".join(lines)
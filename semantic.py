@@ -3,21 +3,154 @@ Phase 3: Semantic Analyzer
 Performs semantic analysis including symbol table construction and cycle detection.
 """
 
-from typing import Dict, List, Set, Optional
-from parser import Program, Declaration, Gate
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Set, Optional, Sequence, Tuple
+from parser import Program, Declaration, Gate, CONSTANTS, TIE_VALUES
 
 
 class SymbolInfo:
     """Information about a symbol in the symbol table."""
     
-    def __init__(self, category: str, defined: bool = False, source: Optional[Gate] = None):
-        self.category = category  # INPUT, OUTPUT, or WIRE
+    __slots__ = ('category', 'defined', 'source', 'used_by')
+    
+    def __init__(self, category: str, defined: bool = False, source: Optional[Gate] = None,
+                 used_by: Sequence[str] = ()):
+        self.category = category  # INPUT, OUTPUT, WIRE, TIE0, or TIE1
         self.defined = defined
         self.source = source  # Gate that produces this symbol
-        self.used_by: List[str] = []  # List of gates that use this symbol
+        self.used_by = used_by  # Gates that use this symbol
     
     def __repr__(self):
-        return f"SymbolInfo(category={self.category}, defined={self.defined}, used_by={self.used_by})"
+        return f"SymbolInfo(category={self.category}, defined={self.defined}, used_by={list(self.used_by)})"
+
+
+class SymbolTable(Mapping):
+    """
+    Symbol table stored as columns indexed by dense integer identifier IDs.
+    
+    IDs are assigned in order of first insertion, and ids is the only index
+    by name. The category, defined flag, source gate and users of each ID
+    live in parallel columns (category None marks an ID without an entry),
+    and the IDs of each category are kept in insertion order, so phases
+    that need all INPUTs or OUTPUTs read a precomputed list. names maps IDs
+    back to identifiers for code emission and diagnostics.
+    
+    The table is also a read-only Mapping from name to SymbolInfo, built
+    from the columns on lookup as QuadTable builds quadruples; entries are
+    added or replaced with table[name] = info.
+    """
+    
+    __slots__ = ('names', 'ids', 'category', 'defined', 'sources', 'used_by', 'categories')
+    
+    def __init__(self):
+        self.names: List[str] = []  # ID -> identifier
+        self.ids: Dict[str, int] = {}  # Identifier -> ID
+        self.category: List[Optional[str]] = []  # ID -> category (None: no entry)
+        self.defined = bytearray()  # ID -> 1 if defined
+        self.sources: List[Optional[Gate]] = []  # ID -> gate that produces it
+        self.used_by: List[Sequence[str]] = []  # ID -> gates that use it
+        self.categories: Dict[str, List[int]] = {}  # Category -> IDs, in insertion order
+    
+    def id_of(self, name: str) -> int:
+        """Return the ID of name, assigning the next free ID if it has none."""
+        index = self.ids.get(name)
+        if index is None:
+            index = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.category.append(None)
+            self.defined.append(0)
+            self.sources.append(None)
+            self.used_by.append(())
+        return index
+    
+    def info(self, index: int) -> Optional[SymbolInfo]:
+        """Return the entry for an ID, or None if it has no entry."""
+        category = self.category[index]
+        if category is None:
+            return None
+        return SymbolInfo(category, bool(self.defined[index]), self.sources[index],
+                          self.used_by[index])
+    
+    def ids_in(self, category: str) -> List[int]:
+        """Return the IDs of every entry in a category, in insertion order."""
+        return self.categories.get(category, [])
+    
+    def names_in(self, category: str) -> List[str]:
+        """Return the names of every entry in a category, in insertion order."""
+        names = self.names
+        return [names[index] for index in self.ids_in(category)]
+    
+    def __getitem__(self, name: str) -> SymbolInfo:
+        info = self.get(name)
+        if info is None:
+            raise KeyError(name)
+        return info
+    
+    def set_info(self, index: int, info: SymbolInfo):
+        """Add or replace the entry for an ID."""
+        old = self.category[index]
+        self.category[index] = info.category
+        self.defined[index] = info.defined
+        self.sources[index] = info.source
+        self.used_by[index] = info.used_by
+        if old == info.category:
+            return
+        if old is not None:
+            self.categories[old].remove(index)
+        category_ids = self.categories.get(info.category)
+        if category_ids is None:
+            category_ids = self.categories[info.category] = []
+        category_ids.append(index)
+    
+    def __setitem__(self, name: str, info: SymbolInfo):
+        self.set_info(self.id_of(name), info)
+    
+    def get(self, name: str, default: Optional[SymbolInfo] = None) -> Optional[SymbolInfo]:
+        index = self.ids.get(name)
+        if index is None:
+            return default
+        info = self.info(index)
+        return default if info is None else info
+    
+    def __contains__(self, name) -> bool:
+        index = self.ids.get(name)
+        return index is not None and self.category[index] is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        names = self.names
+        return (names[index] for index, category in enumerate(self.category) if category is not None)
+    
+    def __len__(self) -> int:
+        return sum(map(len, self.categories.values()))
+    
+    def items(self) -> Iterator[Tuple[str, SymbolInfo]]:
+        """Iterate (name, info) pairs in insertion order."""
+        names = self.names
+        for index, category in enumerate(self.category):
+            if category is not None:
+                yield names[index], self.info(index)
+    
+    def copy(self) -> 'SymbolTable':
+        """Return a copy with the same IDs and entries."""
+        table = self.empty_like()
+        table.category = list(self.category)
+        table.defined = bytearray(self.defined)
+        table.sources = list(self.sources)
+        table.used_by = list(self.used_by)
+        table.categories = {category: list(ids) for category, ids in self.categories.items()}
+        return table
+    
+    def empty_like(self) -> 'SymbolTable':
+        """Return an empty table with the same IDs."""
+        table = SymbolTable()
+        count = len(self.names)
+        table.names = list(self.names)
+        table.ids = dict(self.ids)
+        table.category = [None] * count
+        table.defined = bytearray(count)
+        table.sources = [None] * count
+        table.used_by = [()] * count
+        return table
 
 
 class SemanticAnalyzer:
@@ -25,48 +158,74 @@ class SemanticAnalyzer:
     
     def __init__(self, ast: Program):
         self.ast = ast
-        self.symbol_table: Dict[str, SymbolInfo] = {}
+        self.symbol_table = SymbolTable()
         self.errors: List[str] = []
+        # Per gate: (output ID, input IDs with -1 for constants and undeclared names)
+        self.gate_ids: List[Tuple[int, List[int]]] = []
     
     def build_symbol_table(self):
         """Build symbol table from declarations."""
+        table = self.symbol_table
         for decl in self.ast.declarations:
             for identifier in decl.identifiers:
-                if identifier in self.symbol_table:
+                index = table.id_of(identifier)
+                if table.category[index] is not None:
                     self.errors.append(
                         f"Semantic Error: Identifier '{identifier}' already declared"
                     )
                 else:
-                    self.symbol_table[identifier] = SymbolInfo(
+                    table.set_info(index, SymbolInfo(
                         category=decl.category,
-                        defined=(decl.category != 'OUTPUT')  # INPUTs and WIREs are defined
-                    )
+                        defined=(decl.category != 'OUTPUT')  # INPUTs, WIREs and tie-offs are defined
+                    ))
     
     def populate_gate_info(self):
-        """Add gate information to symbol table."""
+        """
+        Add gate information to symbol table.
+        
+        Every identifier is hashed once here; the later checks and cycle
+        detection work on the IDs recorded in self.gate_ids.
+        """
+        table = self.symbol_table
+        ids = table.ids
+        used_by: Dict[int, List[str]] = {}
+        forward = False  # Some input names a gate output assigned later
         for gate in self.ast.gates:
+            output = table.id_of(gate.output)
+            
             # Add output to symbol table if not already there
-            if gate.output not in self.symbol_table:
-                self.symbol_table[gate.output] = SymbolInfo(
+            if table.category[output] is None:
+                table.set_info(output, SymbolInfo(
                     category='WIRE',
                     defined=True,
                     source=gate
-                )
+                ))
             else:
                 # Mark as defined and set source
-                self.symbol_table[gate.output].defined = True
-                self.symbol_table[gate.output].source = gate
+                table.defined[output] = True
+                table.sources[output] = gate
             
             # Track usage
-            for input_id in gate.inputs:
-                if input_id in self.symbol_table:
-                    self.symbol_table[input_id].used_by.append(gate.output)
+            inputs = [ids.get(name, -1) for name in gate.inputs]
+            for index in inputs:
+                if index >= 0:
+                    used_by.setdefault(index, []).append(gate.output)
+                else:
+                    forward = True
+            
+            self.gate_ids.append((output, inputs))
+        
+        for index, users in used_by.items():
+            table.used_by[index] = tuple(users)
+        if forward:
+            self.gate_ids = [(output, [ids.get(name, -1) for name in gate.inputs])
+                             for gate, (output, _) in zip(self.ast.gates, self.gate_ids)]
     
     def check_declarations(self):
         """Check all identifiers are declared."""
-        for gate in self.ast.gates:
-            for input_id in gate.inputs:
-                if input_id not in self.symbol_table:
+        for gate, (_, inputs) in zip(self.ast.gates, self.gate_ids):
+            for input_id, index in zip(gate.inputs, inputs):
+                if index < 0 and input_id not in CONSTANTS:
                     self.errors.append(
                         f"Semantic Error: Undeclared identifier '{input_id}' "
                         f"used in gate '{gate.output}'"
@@ -95,52 +254,131 @@ class SemanticAnalyzer:
     
     def check_output_definitions(self):
         """Ensure all OUTPUTs are assigned."""
-        for identifier, info in self.symbol_table.items():
-            if info.category == 'OUTPUT' and not info.defined:
+        table = self.symbol_table
+        for index in table.ids_in('OUTPUT'):
+            if not table.defined[index]:
                 self.errors.append(
-                    f"Semantic Error: OUTPUT '{identifier}' never assigned"
+                    f"Semantic Error: OUTPUT '{table.names[index]}' never assigned"
                 )
     
     def check_input_assignments(self):
-        """Ensure INPUTs are not assigned to."""
-        for gate in self.ast.gates:
-            if gate.output in self.symbol_table:
-                if self.symbol_table[gate.output].category == 'INPUT':
-                    self.errors.append(
-                        f"Semantic Error: Cannot assign to INPUT '{gate.output}'"
-                    )
+        """Ensure INPUTs and tied-off pins are not assigned to."""
+        category_of = self.symbol_table.category
+        for gate, (output, _) in zip(self.ast.gates, self.gate_ids):
+            category = category_of[output]
+            if category == 'INPUT':
+                self.errors.append(
+                    f"Semantic Error: Cannot assign to INPUT '{gate.output}'"
+                )
+            elif category in TIE_VALUES:
+                self.errors.append(
+                    f"Semantic Error: Cannot assign to tied-off pin '{gate.output}' "
+                    f"({category})"
+                )
     
-    def detect_cycles(self):
-        """Detect combinational feedback loops using DFS."""
-        visited: Set[str] = set()
-        rec_stack: Set[str] = set()
-        
-        def dfs(node: str, path: List[str]) -> bool:
-            if node in rec_stack:
-                cycle = " -> ".join(path + [node])
+    def check_multiple_assignments(self):
+        """Ensure every identifier is assigned by at most one gate."""
+        seen = set()
+        reported = set()
+        for gate, (output, _) in zip(self.ast.gates, self.gate_ids):
+            if output in seen and output not in reported:
+                reported.add(output)
                 self.errors.append(
-                    f"Semantic Error: Cycle detected: {cycle}"
+                    f"Semantic Error: '{gate.output}' is assigned more than once"
                 )
-                return True
-            
-            if node in visited:
-                return False
-            
-            visited.add(node)
-            rec_stack.add(node)
+            seen.add(output)
+    
+    def build_fanin(self) -> List[List[int]]:
+        """
+        Return, for each symbol ID, the IDs read by the gate that drives it
+        (the last gate assigning it). Undeclared identifiers and constants
+        are skipped.
+        """
+        fanin: List[List[int]] = [[] for _ in self.symbol_table.names]
+        for output, inputs in self.gate_ids:
+            fanin[output] = [index for index in inputs if index >= 0]
+        return fanin
+    
+    def detect_cycles(self):
+        """
+        Detect combinational feedback loops using Tarjan's SCC algorithm.
+        
+        The search uses an explicit stack, so it runs in O(V + E) time and is
+        not bounded by the recursion limit on deep ripple chains. Nodes are
+        symbol IDs and the per-node state lives in arrays indexed by ID.
+        Every strongly connected component that forms a loop is reported as
+        its own error.
+        """
+        fanin = self.build_fanin()
+        count = len(fanin)
+        index_of = [-1] * count
+        lowlink = [0] * count
+        on_stack = bytearray(count)
+        stack: List[int] = []
+        visited = 0
+        
+        for root in range(count):
+            if index_of[root] >= 0:
+                continue
             
-            info = self.symbol_table.get(node)
-            if info and info.source:
-                for input_node in info.source.inputs:
-                    if dfs(input_node, path + [node]):
-                        return True
+            index_of[root] = lowlink[root] = visited
+            visited += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, iter(fanin[root]))]
             
-            rec_stack.remove(node)
-            return False
+            while work:
+                node, successors = work[-1]
+                descended = False
+                
+                for succ in successors:
+                    if index_of[succ] < 0:
+                        index_of[succ] = lowlink[succ] = visited
+                        visited += 1
+                        stack.append(succ)
+                        on_stack[succ] = 1
+                        work.append((succ, iter(fanin[succ])))
+                        descended = True
+                        break
+                    if on_stack[succ]:
+                        lowlink[node] = min(lowlink[node], index_of[succ])
+                
+                if descended:
+                    continue
+                
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                
+                if lowlink[node] == index_of[node]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.add(member)
+                        if member == node:
+                            break
+                    
+                    if len(component) > 1 or node in fanin[node]:
+                        cycle = " -> ".join(self.trace_cycle(node, component, fanin))
+                        self.errors.append(
+                            f"Semantic Error: Cycle detected: {cycle}"
+                        )
+    
+    def trace_cycle(self, start: int, component: Set[int], fanin: List[List[int]]) -> List[str]:
+        """Follow edges inside a strongly connected component until a node repeats."""
+        position = {start: 0}
+        path = [start]
+        node = start
         
-        for identifier in self.symbol_table:
-            if identifier not in visited:
-                dfs(identifier, [])
+        while True:
+            node = next(succ for succ in fanin[node] if succ in component)
+            if node in position:
+                names = self.symbol_table.names
+                return [names[member] for member in path[position[node]:] + [node]]
+            position[node] = len(path)
+            path.append(node)
     
     def analyze(self) -> Dict:
         """Run all semantic checks."""
@@ -153,6 +391,7 @@ class SemanticAnalyzer:
         self.check_gate_arguments()
         self.check_output_definitions()
         self.check_input_assignments()
+        self.check_multiple_assignments()
         self.detect_cycles()
         
         return {
@@ -1,15 +1,85 @@
 #!/usr/bin/env python3
 """
 Test script to compile all example .gate files and run the generated Python code.
-Tests each example file one by one.
+Tests each example file one by one, then checks every simulator of every
+backend, the printed truth table and batch compilation against a reference
+evaluation of the example's gates, that invalid compilations fail with
+the expected errors, and that the compile cache returns the same code.
 """
 
+import io
+import json
+import random
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Dict, List, Tuple
 import time
 
+from astgen import load_functions
+from cache import CompileCache
+from codegen import TRUTH_TABLE_MAX_INPUTS
+from compiler import compile_source, CompileOptions
+from lexer import Lexer
+from parser import Parser, TIE_VALUES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Every input vector is checked up to this many inputs, otherwise a sample
+EXHAUSTIVE_INPUTS = 10
+SAMPLE_VECTORS = 256
+
+# Reference semantics of each gate on 0/1 values
+REFERENCE_GATES = {
+    'AND': lambda a, b: a & b,
+    'OR': lambda a, b: a | b,
+    'XOR': lambda a, b: a ^ b,
+    'NAND': lambda a, b: 1 - (a & b),
+    'NOR': lambda a, b: 1 - (a | b),
+    'NOT': lambda a: 1 - a,
+}
+
+# Compile options checked for every example: (description, options)
+VARIANTS = [
+    ('source', CompileOptions()),
+    ('source, unoptimized', CompileOptions(optimize=False)),
+    ('source, no lookup tables', CompileOptions(lookup_support=0)),
+    ('source, registers and chunks', CompileOptions(reuse_registers=True, chunk_size=2)),
+    ('code', CompileOptions(target='code')),
+    ('code, registers and chunks', CompileOptions(target='code', reuse_registers=True, chunk_size=2)),
+    ('native', CompileOptions(target='native')),
+    ('native, chunks', CompileOptions(target='native', chunk_size=2)),
+]
+
+# Small circuit for the error and cache checks
+HALF_ADDER = """
+CIRCUIT HalfAdder {
+    INPUT A, B;
+    OUTPUT Sum, Carry;
+    Sum = XOR(A, B);
+    Carry = AND(A, B);
+}
+"""
+
+# Compilations that must fail: (description, source, options, error text, expected count)
+ERROR_CASES = [
+    ('--fix of a name that is not an INPUT', HALF_ADDER, CompileOptions(fixed={'Sum': '1'}),
+     "not an INPUT of this circuit", 1),
+    ('--fix to a value other than 0 or 1', HALF_ADDER, CompileOptions(fixed={'A': '2'}),
+     "expected 0 or 1", 1),
+    ('two disjoint loops, one a self-loop',
+     "CIRCUIT T { INPUT A, B; OUTPUT Y; WIRE p, q, s; "
+     "p = AND(q, A); q = OR(p, B); s = AND(s, B); Y = XOR(p, s); }",
+     CompileOptions(), "Cycle detected", 2),
+    ('an OUTPUT assigned twice',
+     "CIRCUIT T { INPUT A, B; OUTPUT Y; Y = AND(A, B); Y = OR(A, B); }",
+     CompileOptions(), "assigned more than once", 1),
+]
+
 # Colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -116,6 +186,226 @@ def run_python_file(python_file: Path) -> Tuple[bool, str]:
     except Exception as e:
         return False, str(e)
 
+def reference_evaluator(source: str) -> Tuple[List[str], List[str], Callable]:
+    """
+    Parse source and return (inputs, outputs, evaluate), where evaluate maps
+    a tuple of input values to the tuple of output values by evaluating the
+    gates directly, independent of the later compiler phases.
+    """
+    program = Parser(Lexer().tokenize(source)).parse()
+    inputs: List[str] = []
+    outputs: List[str] = []
+    constants = {'0': 0, '1': 1}
+    for decl in program.declarations:
+        if decl.category == 'INPUT':
+            inputs.extend(decl.identifiers)
+        elif decl.category == 'OUTPUT':
+            outputs.extend(decl.identifiers)
+        elif decl.category in TIE_VALUES:
+            constants.update((name, int(TIE_VALUES[decl.category])) for name in decl.identifiers)
+    gates = {gate.output: gate for gate in program.gates}
+    
+    def evaluate(vector: Tuple[int, ...]) -> Tuple[int, ...]:
+        values = dict(constants)
+        values.update(zip(inputs, vector))
+        
+        def value(name: str) -> int:
+            if name not in values:
+                gate = gates[name]
+                values[name] = REFERENCE_GATES[gate.gate_type](*[value(operand) for operand in gate.inputs])
+            return values[name]
+        
+        return tuple(value(name) for name in outputs)
+    
+    return inputs, outputs, evaluate
+
+def input_vectors(count: int) -> List[Tuple[int, ...]]:
+    """Return every vector of count inputs, or a fixed random sample if there are too many."""
+    if count <= EXHAUSTIVE_INPUTS:
+        return [tuple(row >> (count - 1 - j) & 1 for j in range(count)) for row in range(1 << count)]
+    rng = random.Random(count)
+    return [tuple(rng.getrandbits(1) for _ in range(count)) for _ in range(SAMPLE_VECTORS)]
+
+def load_simulators(result) -> Dict[str, Callable]:
+    """Return the simulators of a successful compile result by name."""
+    if result.native is not None:
+        return {'simulate': result.native.simulate, 'simulate_words': result.native.simulate_words}
+    if result.code_object is not None:
+        return load_functions(result.code_object)
+    namespace = {'__name__': 'generated', 'print': lambda *args, **kwargs: None}
+    exec(result.code, namespace)
+    return namespace
+
+def pack(vectors: List[Tuple[int, ...]], width: int) -> List[int]:
+    """Pack vectors bit-parallel: bit r of word j is input j of vector r."""
+    return [sum(vector[j] << row for row, vector in enumerate(vectors)) for j in range(width)]
+
+def compare_simulators(functions: Dict[str, Callable], vectors: List[Tuple[int, ...]],
+                       expected: List[Tuple[int, ...]]) -> List[str]:
+    """Return a message for the first mismatch of each simulator with the expected outputs."""
+    problems = []
+    width = len(vectors[0]) if vectors else 0
+    
+    simulate = functions['simulate']
+    for vector, outputs in zip(vectors, expected):
+        got = simulate(*vector)
+        got = got if isinstance(got, tuple) else (got,)
+        if tuple(int(bit) for bit in got) != outputs:
+            problems.append(f"simulate{vector} returned {got}, expected {outputs}")
+            break
+    
+    if 'simulate_packed' in functions:
+        mask = (1 << len(vectors)) - 1
+        packed = functions['simulate_packed'](*pack(vectors, width), mask)
+        packed = packed if isinstance(packed, tuple) else (packed,)
+        for row, outputs in enumerate(expected):
+            got = tuple(word >> row & 1 for word in packed)
+            if got != outputs:
+                problems.append(f"simulate_packed row {vectors[row]} gave {got}, expected {outputs}")
+                break
+    
+    if 'simulate_batch' in functions and np is not None:
+        batch = functions['simulate_batch'](np.array(vectors, dtype=np.uint8).reshape(len(vectors), width))
+        for vector, got, outputs in zip(vectors, batch.tolist(), expected):
+            if tuple(got) != outputs:
+                problems.append(f"simulate_batch row {vector} gave {tuple(got)}, expected {outputs}")
+                break
+    
+    if 'simulate_words' in functions:
+        for start in range(0, len(vectors), 64):
+            block = vectors[start:start + 64]
+            words = functions['simulate_words']([pack(block, width)])[0]
+            mismatch = next((row for row, outputs in enumerate(expected[start:start + 64])
+                             if tuple(word >> row & 1 for word in words) != outputs), None)
+            if mismatch is not None:
+                problems.append(f"simulate_words row {block[mismatch]} disagrees with the reference")
+                break
+    
+    return problems
+
+def check_simulators(source: str) -> List[str]:
+    """
+    Compile source with every variant in VARIANTS and once per OUTPUT cone,
+    and compare the simulators with the reference evaluation. Returns one
+    message per mismatch; the native target is skipped without a C compiler.
+    """
+    inputs, outputs, evaluate = reference_evaluator(source)
+    vectors = input_vectors(len(inputs))
+    expected = [evaluate(vector) for vector in vectors]
+    problems = []
+    
+    for description, options in VARIANTS:
+        result = compile_source(source, options)
+        if not result.success:
+            if options.target == 'native' and result.failed_phase == 'codegen':
+                print_info(f"Skipped {description}: {result.errors[0].splitlines()[0]}")
+                continue
+            problems.append(f"{description}: compilation failed: {result.errors[0]}")
+            continue
+        problems.extend(f"{description}: {problem}"
+                        for problem in compare_simulators(load_simulators(result), vectors, expected))
+    
+    # Cone extraction keeps only the INPUTs the selected OUTPUT reads
+    for index, output in enumerate(outputs):
+        result = compile_source(source, CompileOptions(outputs=[output]))
+        if not result.success:
+            problems.append(f"cone of {output}: compilation failed: {result.errors[0]}")
+            continue
+        positions = [inputs.index(name) for name in result.optimized_symbol_table.names_in('INPUT')]
+        cone_vectors = [tuple(vector[j] for j in positions) for vector in vectors]
+        cone_expected = [(row[index],) for row in expected]
+        problems.extend(f"cone of {output}: {problem}"
+                        for problem in compare_simulators(load_simulators(result), cone_vectors, cone_expected))
+    
+    # Partial evaluation drops a fixed INPUT and must match the reference with it held
+    for value in (0, 1) if inputs else ():
+        fixed = f"{inputs[0]}={value}"
+        result = compile_source(source, CompileOptions(fixed={inputs[0]: str(value)}))
+        if not result.success:
+            problems.append(f"fix {fixed}: compilation failed: {result.errors[0]}")
+            continue
+        positions = [inputs.index(name) for name in result.optimized_symbol_table.names_in('INPUT')]
+        held = [index for index, vector in enumerate(vectors) if vector[0] == value]
+        fixed_vectors = [tuple(vectors[index][j] for j in positions) for index in held]
+        fixed_expected = [expected[index] for index in held]
+        problems.extend(f"fix {fixed}: {problem}"
+                        for problem in compare_simulators(load_simulators(result), fixed_vectors, fixed_expected))
+    
+    return problems
+
+def check_truth_table(source: str, output: str) -> List[str]:
+    """Compare the truth table printed by a generated file with the reference evaluation."""
+    inputs, _, evaluate = reference_evaluator(source)
+    rows = [line.split(' || ') for line in output.splitlines() if ' || ' in line]
+    rows = [(values.split(), results.split()) for values, results in rows
+            if set(values.split()) <= {'0', '1'}]
+    
+    if len(inputs) > TRUTH_TABLE_MAX_INPUTS:
+        return [] if not rows else [f"truth table printed for {len(inputs)} inputs"]
+    if len(rows) != 1 << len(inputs):
+        return [f"truth table has {len(rows)} rows, expected {1 << len(inputs)}"]
+    
+    for values, results in rows:
+        vector = tuple(int(bit) for bit in values)
+        got = tuple(int(bit) for bit in results)
+        if got != evaluate(vector):
+            return [f"truth table row {' '.join(values)} gives {got}, expected {evaluate(vector)}"]
+    return []
+
+def check_batch(examples_dir: Path) -> List[str]:
+    """
+    Compile the examples directory with --batch and compare the truth table
+    of every generated file with the reference evaluation.
+    """
+    result = subprocess.run(
+        [sys.executable, "compiler.py", "--batch", str(examples_dir), "-j", "2"],
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    records = [json.loads(line) for line in result.stdout.splitlines() if line.startswith('{')]
+    problems = []
+    for record in sorted(records, key=lambda record: record['file']):
+        if record['status'] != 'ok':
+            problems.append(f"{Path(record['file']).name}: {record['error']}")
+            continue
+        success, output = run_python_file(Path(record['output']))
+        if not success:
+            problems.append(f"{Path(record['file']).name}: execution failed")
+            continue
+        source = Path(record['file']).read_text()
+        problems.extend(f"{Path(record['file']).name}: {problem}"
+                        for problem in check_truth_table(source, output))
+    return problems
+
+def check_errors() -> List[str]:
+    """Compile every case in ERROR_CASES and check it fails with the expected errors."""
+    problems = []
+    for description, source, options, message, count in ERROR_CASES:
+        result = compile_source(source, options)
+        found = [error for error in result.errors if message in error]
+        if result.success or len(found) != count:
+            problems.append(f"{description}: expected {count} error(s) with '{message}', "
+                            f"got {result.errors}")
+    return problems
+
+def check_cache() -> List[str]:
+    """Compile HALF_ADDER twice into a fresh cache, first into code and then into a sink."""
+    problems = []
+    for streamed in (False, True):
+        label = "streamed first compile" if streamed else "first compile"
+        with tempfile.TemporaryDirectory() as directory:
+            cache = CompileCache(directory)
+            sink = io.StringIO() if streamed else None
+            first = compile_source(HALF_ADDER, CompileOptions(cache=cache, sink=sink))
+            second = compile_source(HALF_ADDER, CompileOptions(cache=cache))
+            code = sink.getvalue() if streamed else first.code
+            if first.cached or not second.cached:
+                problems.append(f"{label}: cached was {first.cached}, then {second.cached}")
+            if not code or second.code != code:
+                problems.append(f"{label}: cached code differs from the compiled code")
+    return problems
+
 def main():
     """Main test function."""
     print_header("LOGICAL COMPILER - AUTOMATED TEST SUITE")
@@ -142,6 +432,7 @@ def main():
     total_files = len(gate_files)
     successful_compilations = 0
     successful_executions = 0
+    successful_checks = 0
     failed_files = []
     
     # Process each file one by one
@@ -156,7 +447,7 @@ def main():
         print_info(f"Output file: {output_file}")
         
         # Step 1: Compile
-        print(f"\n{Colors.OKBLUE}[1/2] Compiling...{Colors.ENDC}")
+        print(f"\n{Colors.OKBLUE}[1/3] Compiling...{Colors.ENDC}")
         if compile_file(gate_file, output_file):
             print_success(f"Compilation successful: {output_file.name}")
             successful_compilations += 1
@@ -167,7 +458,7 @@ def main():
             continue
         
         # Step 2: Run generated Python file
-        print(f"\n{Colors.OKBLUE}[2/2] Running generated code...{Colors.ENDC}")
+        print(f"\n{Colors.OKBLUE}[2/3] Running generated code...{Colors.ENDC}")
         success, output = run_python_file(output_file)
         
         if success:
@@ -181,17 +472,59 @@ def main():
             print_error(f"Execution failed: {output_file.name}")
             print(f"Error: {output}")
             failed_files.append((gate_file.name, f"Execution failed: {output[:50]}"))
+            print(f"\n{'-'*70}\n")
+            continue
+        
+        # Step 3: Check simulators and the truth table against the reference
+        print(f"\n{Colors.OKBLUE}[3/3] Checking against reference evaluation...{Colors.ENDC}")
+        source = gate_file.read_text()
+        problems = check_truth_table(source, output) + check_simulators(source)
+        if problems:
+            for problem in problems:
+                print_error(problem)
+            failed_files.append((gate_file.name, f"Mismatch: {problems[0][:50]}"))
+        else:
+            print_success("All simulators and the truth table match the reference")
+            successful_checks += 1
         
         # Small delay between tests
         time.sleep(0.5)
         print(f"\n{'-'*70}\n")
     
+    # Batch compilation of the whole directory
+    print_header("Batch compilation")
+    batch_problems = check_batch(examples_dir)
+    for problem in batch_problems:
+        print_error(problem)
+        failed_files.append(("--batch", problem[:70]))
+    if not batch_problems:
+        print_success("Every batch-compiled example matches the reference")
+    
+    # Invalid circuits and options
+    print_header("Error reporting")
+    error_problems = check_errors()
+    for problem in error_problems:
+        print_error(problem)
+        failed_files.append(("errors", problem[:70]))
+    if not error_problems:
+        print_success(f"All {len(ERROR_CASES)} invalid compilations report the expected errors")
+    
+    # Compile cache hits
+    print_header("Compile cache")
+    cache_problems = check_cache()
+    for problem in cache_problems:
+        print_error(problem)
+        failed_files.append(("cache", problem[:70]))
+    if not cache_problems:
+        print_success("Second compiles are cache hits with the same code")
+    
     # Print summary
     print_header("TEST SUMMARY")
     
     print(f"{Colors.BOLD}Total files tested:{Colors.ENDC} {total_files}")
     print(f"{Colors.OKGREEN}Successful compilations:{Colors.ENDC} {successful_compilations}/{total_files}")
     print(f"{Colors.OKGREEN}Successful executions:{Colors.ENDC} {successful_executions}/{total_files}")
+    print(f"{Colors.OKGREEN}Matching the reference:{Colors.ENDC} {successful_checks}/{total_files}")
     
     if failed_files:
         try:
@@ -202,7 +535,7 @@ def main():
             print(f"  - {file_name}: {reason}")
     
     # Overall result
-    if successful_compilations == total_files and successful_executions == total_files:
+    if not failed_files:
         try:
             print(f"\n{Colors.OKGREEN}{Colors.BOLD}[SUCCESS] ALL TESTS PASSED!{Colors.ENDC}")
         except UnicodeEncodeError: